@@ -1,18 +1,68 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import signal
+import sys
+import threading
+import weakref
 from contextlib import ExitStack
-from itertools import chain
-from typing import Any
+from types import FrameType
+from typing import Any, Callable, Iterator, Union
 
-from mangum.exceptions import ConfigurationError
-from mangum.handlers import ALB, APIGateway, HTTPGateway, LambdaAtEdge
-from mangum.protocols import HTTPCycle, LifespanCycle
-from mangum.types import ASGI, LambdaConfig, LambdaContext, LambdaEvent, LambdaHandler, LifespanMode
+from mangum.cache import ResponseCache
+from mangum.compression import compress_response
+from mangum.conditional import add_etag, get_not_modified_response, is_not_modified
+from mangum.exceptions import ConfigurationError, LifespanFailure
+from mangum.handlers import (
+    ALB,
+    SQS,
+    APIGateway,
+    APIGatewayWebSocket,
+    BatchHandler,
+    DynamoDBStreams,
+    HTTPBatch,
+    HTTPGateway,
+    Kinesis,
+    LambdaAtEdge,
+)
+from mangum.protocols import BatchCycle, HTTPCycle, LifespanCycle, WebSocketCycle, WebSocketCycleState
+from mangum.storage import STORED_HEADERS, ResponseStore
+from mangum.streaming import HTTPIntegrationResponseStream, StreamWriter
+from mangum.types import (
+    ASGI,
+    LambdaConfig,
+    LambdaContext,
+    LambdaEvent,
+    LambdaHandler,
+    LifespanMode,
+    Response,
+    ResponseStream,
+    StartupMode,
+)
+from mangum.websocket import ConnectionStore, ManagementAPI, MemoryConnectionStore
 
 logger = logging.getLogger("mangum")
 
-HANDLERS: list[type[LambdaHandler]] = [ALB, HTTPGateway, APIGateway, LambdaAtEdge]
+# The handlers of the HTTP, batch and WebSocket events.
+EventHandler = Union[LambdaHandler, BatchHandler, APIGatewayWebSocket]
+
+HANDLERS: list[type[EventHandler]] = [
+    ALB,
+    HTTPGateway,
+    APIGateway,
+    LambdaAtEdge,
+    APIGatewayWebSocket,
+    SQS,
+    Kinesis,
+    DynamoDBStreams,
+    HTTPBatch,
+]
+
+# A function only receives a few event shapes, the bound only guards against events
+# with arbitrary top-level keys.
+MAX_INFERRED_HANDLERS = 32
 
 DEFAULT_TEXT_MIME_TYPES: list[str] = [
     "text/",
@@ -23,6 +73,20 @@ DEFAULT_TEXT_MIME_TYPES: list[str] = [
     "application/vnd.oai.openapi",
 ]
 
+# The number of records of a batch event run at the same time.
+DEFAULT_BATCH_CONCURRENCY = 10
+
+# The buffered response payload is limited to 6 MB, this leaves room for the headers.
+DEFAULT_RESPONSE_STORE_THRESHOLD = 6 * 1000 * 1000
+
+
+def may_infer(handler_cls: type[EventHandler], event_signature: frozenset[str]) -> bool:
+    """Returns whether the handler may match an event with the given top-level keys. The
+    handlers without `required_keys` (such as most custom handlers) may match any event.
+    """
+    required_keys: frozenset[str] | None = getattr(handler_cls, "required_keys", None)
+    return required_keys is None or required_keys <= event_signature
+
 
 class Mangum:
     def __init__(
@@ -30,26 +94,145 @@ class Mangum:
         app: ASGI,
         lifespan: LifespanMode = "auto",
         api_gateway_base_path: str = "/",
-        custom_handlers: list[type[LambdaHandler]] | None = None,
+        custom_handlers: list[type[EventHandler]] | None = None,
+        handler: type[EventHandler] | None = None,
         text_mime_types: list[str] | None = None,
         exclude_headers: list[str] | None = None,
+        persistent_lifespan: bool = False,
+        startup: StartupMode = "invocation",
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
+        deadline_margin_ms: int | None = None,
+        defer_background_work: bool = False,
+        background_timeout_ms: int = 10000,
+        request_chunk_size: int | None = None,
+        compression_minimum_size: int | None = None,
+        response_store: ResponseStore | None = None,
+        response_store_threshold: int = DEFAULT_RESPONSE_STORE_THRESHOLD,
+        response_cache: ResponseCache | None = None,
+        etag: bool = False,
+        event_routes: dict[str, str] | None = None,
+        batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        connection_store: ConnectionStore | None = None,
+        management_api: ManagementAPI | None = None,
     ) -> None:
         if lifespan not in ("auto", "on", "off"):
             raise ConfigurationError("Invalid argument supplied for `lifespan`. Choices are: auto|on|off")
 
+        if startup not in ("invocation", "init"):
+            raise ConfigurationError("Invalid argument supplied for `startup`. Choices are: invocation|init")
+
+        if deadline_margin_ms is not None and deadline_margin_ms < 0:
+            raise ConfigurationError("Invalid argument supplied for `deadline_margin_ms`. Must be zero or greater.")
+
+        # Deferred work would otherwise still be running when the lifespan shutdown of the
+        # invocation closes the resources it depends on.
+        if defer_background_work and lifespan != "off" and not (persistent_lifespan or startup == "init"):
+            raise ConfigurationError(
+                "Invalid argument supplied for `defer_background_work`. "
+                "A persistent lifespan is required unless lifespan is off."
+            )
+
+        if request_chunk_size is not None and request_chunk_size <= 0:
+            raise ConfigurationError("Invalid argument supplied for `request_chunk_size`. Must be greater than zero.")
+
+        if compression_minimum_size is not None and compression_minimum_size < 0:
+            raise ConfigurationError(
+                "Invalid argument supplied for `compression_minimum_size`. Must be zero or greater."
+            )
+
+        if response_store_threshold <= 0:
+            raise ConfigurationError(
+                "Invalid argument supplied for `response_store_threshold`. Must be greater than zero."
+            )
+
+        if batch_concurrency <= 0:
+            raise ConfigurationError("Invalid argument supplied for `batch_concurrency`. Must be greater than zero.")
+
         self.app = app
         self.lifespan = lifespan
+        # Starting the application during the INIT phase only makes sense if the
+        # lifespan cycle is kept open for the following invocations.
+        self.persistent_lifespan = persistent_lifespan or startup == "init"
+        self.startup_mode = startup
+        self.lifespan_cycle: LifespanCycle | None = None
+        self.startup_exception: LifespanFailure | None = None
+        self.loop_factory = loop_factory
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.deadline_margin_ms = deadline_margin_ms
+        self.defer_background_work = defer_background_work
+        self.background_timeout_ms = background_timeout_ms
+        self.background_cycles: list[HTTPCycle] = []
+        self.request_chunk_size = request_chunk_size
+        self.compression_minimum_size = compression_minimum_size
+        self.response_store = response_store
+        self.response_store_threshold = response_store_threshold
+        self.response_cache = response_cache
+        self.etag = etag
+        self.batch_concurrency = batch_concurrency
+        self.connection_store = connection_store or MemoryConnectionStore()
+        self.management_api = management_api or ManagementAPI()
         self.custom_handlers = custom_handlers or []
-        exclude_headers = exclude_headers or []
+        self.handler = handler
+        self.inferred_handlers: dict[frozenset[str], tuple[type[EventHandler], tuple[type[EventHandler], ...]]] = {}
         self.config = LambdaConfig(
-            api_gateway_base_path=api_gateway_base_path or "/",
-            text_mime_types=text_mime_types or [*DEFAULT_TEXT_MIME_TYPES],
-            exclude_headers=[header.lower() for header in exclude_headers],
+            api_gateway_base_path=api_gateway_base_path,
+            text_mime_types=text_mime_types or DEFAULT_TEXT_MIME_TYPES,
+            exclude_headers=exclude_headers or (),
+            event_routes=event_routes,
         )
 
-    def infer(self, event: LambdaEvent, context: LambdaContext) -> LambdaHandler:
-        for handler_cls in chain(self.custom_handlers, HANDLERS):
+        if self.startup_mode == "init" and self.lifespan in ("auto", "on"):
+            try:
+                self.startup()
+            except LifespanFailure as exc:
+                # Raised on the first invocation instead, so the failure is reported
+                # for a request rather than crashing the module import.
+                logger.error("Application startup failed during init.", exc_info=exc)
+                self.startup_exception = exc
+
+    def infer(self, event: LambdaEvent, context: LambdaContext) -> EventHandler:
+        if self.handler is not None:
+            try:
+                handler = self.handler(event, context, self.config)
+                if isinstance(handler, BatchHandler):
+                    handler.requests
+                elif isinstance(handler, APIGatewayWebSocket):
+                    handler.connection
+                else:
+                    handler.scope
+            except (KeyError, IndexError, TypeError):
+                logger.warning(
+                    "The event does not match the %s handler, the handler will be inferred.",
+                    self.handler.__name__,
+                )
+            else:
+                return handler
+
+        # The handlers are checked in order for the first event with a given set of
+        # top-level keys. For the next events, the same handler is checked along with the
+        # handlers before it that may also match events with these keys, so that the
+        # order of the handlers is kept.
+        event_signature = frozenset(event)
+        inferred = self.inferred_handlers.get(event_signature)
+        if inferred is not None:
+            inferred_handler_cls, preceding_handlers = inferred
+            if inferred_handler_cls.infer(event, context, self.config) and not any(
+                handler_cls.infer(event, context, self.config) for handler_cls in preceding_handlers
+            ):
+                return inferred_handler_cls(event, context, self.config)
+
+        handlers = [*self.custom_handlers, *HANDLERS]
+        for index, handler_cls in enumerate(handlers):
             if handler_cls.infer(event, context, self.config):
+                if len(self.inferred_handlers) < MAX_INFERRED_HANDLERS:
+                    self.inferred_handlers[event_signature] = (
+                        handler_cls,
+                        tuple(
+                            preceding_handler
+                            for preceding_handler in handlers[:index]
+                            if may_infer(preceding_handler, event_signature)
+                        ),
+                    )
                 return handler_cls(event, context, self.config)
         raise RuntimeError(  # pragma: no cover
             "The adapter was unable to infer a handler to use for the event. This "
@@ -58,18 +241,283 @@ class Mangum:
             "supported handler.)"
         )
 
-    def __call__(self, event: LambdaEvent, context: LambdaContext) -> dict[str, Any]:
-        handler = self.infer(event, context)
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop owned by the adapter, created on first use and reused for the
+        life of the execution environment so that loop-bound resources created during
+        the lifespan startup remain valid across invocations.
+        """
+        if self._loop is None:
+            self._loop = (self.loop_factory or asyncio.new_event_loop)()
+            if sys.version_info < (3, 10):  # pragma: no cover
+                # Before Python 3.10 the asyncio primitives bind to the current event
+                # loop when they are created rather than when they are first used.
+                asyncio.set_event_loop(self._loop)
+            weakref.finalize(self, self._loop.close)
+
+        return self._loop
+
+    def startup(self) -> LifespanCycle:
+        """Runs the lifespan startup once and keeps the cycle open for the life of the
+        execution environment. Subsequent calls return the running cycle.
+
+        A startup failure stored during the INIT phase is raised once, after which the
+        startup is attempted again on the next call.
+        """
+        if self.startup_exception is not None:
+            startup_exception, self.startup_exception = self.startup_exception, None
+            raise startup_exception
+
+        if self.lifespan_cycle is None:
+            lifespan_cycle = LifespanCycle(self.app, self.lifespan, self.loop)
+            lifespan_cycle.__enter__()
+            self.lifespan_cycle = lifespan_cycle
+            self._install_sigterm_handler()
+
+        return self.lifespan_cycle
+
+    def shutdown(self) -> None:
+        """Runs the lifespan shutdown for a cycle opened by `startup`, if any."""
+        self.drain_background_work(None)
+        lifespan_cycle, self.lifespan_cycle = self.lifespan_cycle, None
+        if lifespan_cycle is not None:
+            lifespan_cycle.__exit__(None, None, None)
+
+    def _install_sigterm_handler(self) -> None:
+        # The runtime sends SIGTERM before the execution environment is shut down
+        # (when at least one extension is registered). Signal handlers can only be
+        # installed from the main thread.
+        if threading.current_thread() is not threading.main_thread():  # pragma: no cover
+            return
+        # The handler is kept if it is still installed from an earlier lifespan cycle,
+        # otherwise it would be saved as its own previous handler.
+        if signal.getsignal(signal.SIGTERM) == self._handle_sigterm:
+            return
+        self._previous_sigterm_handler = signal.signal(signal.SIGTERM, self._handle_sigterm)
+
+    def _handle_sigterm(self, signum: int, frame: FrameType | None) -> None:
+        logger.info("SIGTERM received, running application shutdown.")
+        try:
+            self.shutdown()
+        finally:
+            previous_handler = self._previous_sigterm_handler
+            if callable(previous_handler):
+                previous_handler(signum, frame)
+            elif previous_handler != signal.SIG_IGN:
+                sys.exit(0)
+
+    def get_timeout(self, context: LambdaContext) -> float | None:
+        """Returns the time in seconds the application may run before the invocation
+        deadline, less the safety margin, if a `deadline_margin_ms` is configured.
+        """
+        if self.deadline_margin_ms is None:
+            return None
+        get_remaining_time_in_millis = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining_time_in_millis is None:
+            return None
+
+        remaining_time_in_millis: int = get_remaining_time_in_millis()
+        return max(remaining_time_in_millis - self.deadline_margin_ms, 0) / 1000
+
+    def drain_background_work(self, context: LambdaContext | None) -> None:
+        """Waits for application work left running after earlier responses were returned,
+        cancelling any that does not finish within `background_timeout_ms`, or before the
+        deadline of the invocation being handled if it is sooner.
+        """
+        background_cycles, self.background_cycles = self.background_cycles, []
+        pending = {cycle.app_task for cycle in background_cycles if cycle.app_task is not None}
+        if not pending:
+            return
+
+        timeout = self.background_timeout_ms / 1000
+        deadline_timeout = None if context is None else self.get_timeout(context)
+        if deadline_timeout is not None:
+            timeout = min(timeout, deadline_timeout)
+        self.loop.run_until_complete(asyncio.wait(pending, timeout=timeout))
+        for cycle in background_cycles:
+            if cycle.app_task is not None and not cycle.app_task.done():
+                logger.warning(
+                    "%s %s background work cancelled after %d ms.",
+                    cycle.scope["method"],
+                    cycle.scope["path"],
+                    timeout * 1000,
+                )
+                cycle.cancel()
+        self.loop.run_until_complete(asyncio.wait(pending))
+
+    def get_body(self, handler: LambdaHandler) -> bytes | Iterator[bytes]:
+        """Returns the request body, or an iterator that decodes it in chunks of
+        `request_chunk_size` bytes if configured and supported by the handler.
+        """
+        iter_body = getattr(handler, "iter_body", None)
+        if self.request_chunk_size is None or iter_body is None:
+            return handler.body
+
+        body_chunks: Iterator[bytes] = iter_body(self.request_chunk_size)
+        return body_chunks
+
+    def enter_lifespan(self, stack: ExitStack) -> dict[str, Any] | None:
+        """Enters the lifespan cycle for the invocation if enabled, returning its state."""
+        if self.lifespan not in ("auto", "on"):
+            return None
+        if self.persistent_lifespan:
+            lifespan_cycle = self.startup()
+        else:
+            lifespan_cycle = LifespanCycle(self.app, self.lifespan, self.loop)
+            stack.enter_context(lifespan_cycle)
+        return lifespan_cycle.lifespan_state
+
+    def run(
+        self,
+        handler: LambdaHandler,
+        context: LambdaContext,
+        stream: ResponseStream | None = None,
+    ) -> Response:
+        """Runs the HTTP cycle for an event, within the lifespan cycle if enabled, unless
+        a cached response is found in the `response_cache`.
+        """
+        self.drain_background_work(context)
         scope = handler.scope
+        response_cache = self.response_cache if stream is None else None
+        if response_cache is not None:
+            response_cache.configure(context)
+            cached_response = response_cache.get(scope)
+            if cached_response is not None:
+                return cached_response
+
         with ExitStack() as stack:
-            if self.lifespan in ("auto", "on"):
-                lifespan_cycle = LifespanCycle(self.app, self.lifespan)
-                stack.enter_context(lifespan_cycle)
-                scope.update({"state": lifespan_cycle.lifespan_state.copy()})
+            lifespan_state = self.enter_lifespan(stack)
+            if lifespan_state is not None:
+                scope.update({"state": lifespan_state.copy()})
 
-            http_cycle = HTTPCycle(scope, handler.body)
-            http_response = http_cycle(self.app)
+            http_cycle = HTTPCycle(scope, self.get_body(handler), self.loop, stream)
+            http_response = http_cycle(self.app, self.get_timeout(context), not self.defer_background_work)
+            if http_cycle.app_task is not None and not http_cycle.app_task.done():
+                self.background_cycles.append(http_cycle)
 
-            return handler(http_response)
+            if self.compression_minimum_size is not None and stream is None:
+                http_response = compress_response(
+                    http_response,
+                    scope,
+                    text_mime_types=self.config["text_mime_types"],
+                    minimum_size=self.compression_minimum_size,
+                )
+
+            if self.etag and stream is None and scope["method"] == "GET":
+                http_response = add_etag(http_response)
+
+            if response_cache is not None:
+                response_cache.put(scope, http_response)
+
+            return http_response
+
+        assert False, "unreachable"  # pragma: no cover
+
+    def run_batch(self, handler: BatchHandler, context: LambdaContext) -> list[Response | None]:
+        """Runs the requests for the records of a batch event concurrently, at most
+        `batch_concurrency` at a time, within the lifespan cycle if enabled.
+        """
+        self.drain_background_work(context)
+        requests = handler.requests
+        with ExitStack() as stack:
+            lifespan_state = self.enter_lifespan(stack)
+            if lifespan_state is not None:
+                for request in requests:
+                    request["scope"].update({"state": lifespan_state.copy()})
+
+            batch_cycle = BatchCycle(requests, self.loop, self.batch_concurrency)
+            return batch_cycle(self.app, self.get_timeout(context))
 
         assert False, "unreachable"  # pragma: no cover
+
+    def run_websocket(self, handler: APIGatewayWebSocket, context: LambdaContext) -> Response:
+        """Runs the application for an event of a WebSocket connection, within the
+        lifespan cycle if enabled, then posts the messages it sent to the connection.
+        """
+        self.drain_background_work(context)
+        connection_id = handler.connection_id
+        connecting = handler.event_type == "CONNECT"
+        scope = handler.build_scope(None if connecting else self.connection_store.get(connection_id))
+        with ExitStack() as stack:
+            lifespan_state = self.enter_lifespan(stack)
+            if lifespan_state is not None:
+                scope.update({"state": lifespan_state.copy()})
+
+            cycle = WebSocketCycle(
+                scope, handler.message, self.loop, connected=not connecting, close_code=handler.close_code
+            )
+            cycle(self.app, self.get_timeout(context))
+
+        status = cycle.status
+        headers = cycle.headers
+        if handler.event_type == "CONNECT":
+            if status != 200 or cycle.state is not WebSocketCycleState.CONNECTED:
+                # The connection is denied unless the application accepted it.
+                return {"status": 403 if status == 200 else status, "headers": [], "body": b""}
+            self.connection_store.put(connection_id, {**handler.connection, "subprotocol": cycle.subprotocol})
+            if cycle.subprotocol is not None:
+                headers = [*headers, [b"sec-websocket-protocol", cycle.subprotocol.encode()]]
+            if cycle.sent_messages:
+                logger.warning("Messages cannot be sent to a WebSocket connection until it is open, they are dropped.")
+        elif handler.event_type == "DISCONNECT":
+            self.connection_store.delete(connection_id)
+        else:
+            closed = cycle.state is WebSocketCycleState.CLOSED
+            if closed:
+                self.connection_store.delete(connection_id)
+            if cycle.sent_messages or closed:
+                self.management_api.send(handler.endpoint_url, connection_id, cycle.sent_messages, close=closed)
+
+        return {"status": status, "headers": headers, "body": b""}
+
+    def stream(self, event: LambdaEvent, context: LambdaContext, writer: StreamWriter) -> None:
+        """Handles an event by streaming the response to the writer as it is produced by
+        the application, using the Lambda response streaming HTTP integration format.
+        """
+        handler = self.infer(event, context)
+        if isinstance(handler, (BatchHandler, APIGatewayWebSocket)):
+            raise RuntimeError(f"The responses to {handler.event_source} events cannot be streamed.")
+        self.run(handler, context, HTTPIntegrationResponseStream(handler, writer))
+
+    def store_response(self, http_response: Response) -> Response:
+        """Stores the response body in the `response_store` and returns a redirect to the
+        URL it is served from, keeping the cookies set by the application.
+        """
+        assert self.response_store is not None
+        stored_headers: dict[str, str] = {}
+        redirect_headers = []
+        for key, value in http_response["headers"]:
+            lower_key = key.decode().lower()
+            if lower_key in STORED_HEADERS:
+                stored_headers[lower_key] = value.decode()
+            elif lower_key == "set-cookie":
+                redirect_headers.append([key, value])
+
+        url = self.response_store.put(http_response["body"], stored_headers)
+        redirect_headers.append([b"location", url.encode()])
+        return {"status": 303, "headers": redirect_headers, "body": b""}
+
+    def __call__(self, event: LambdaEvent, context: LambdaContext) -> dict[str, Any]:
+        handler = self.infer(event, context)
+        if isinstance(handler, BatchHandler):
+            return handler(self.run_batch(handler, context))
+        if isinstance(handler, APIGatewayWebSocket):
+            return handler(self.run_websocket(handler, context))
+
+        http_response = self.run(handler, context)
+        if self.etag and is_not_modified(handler.scope, http_response):
+            return handler(get_not_modified_response(http_response))
+        if self.response_store is None or not 200 <= http_response["status"] < 300:
+            return handler(http_response)
+
+        # The encoded body is at least the size of the body, and at most a third larger
+        # if it is base64 encoded, so it only needs to be measured in between.
+        body_size = len(http_response["body"])
+        if body_size > self.response_store_threshold:
+            return handler(self.store_response(http_response))
+        response = handler(http_response)
+        if math.ceil(body_size / 3) * 4 > self.response_store_threshold and (
+            len(response.get("body") or "") > self.response_store_threshold
+        ):
+            return handler(self.store_response(http_response))
+        return response
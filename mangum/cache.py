@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from mangum.headers import get_combined_header
+from mangum.types import LambdaContext, Response, Scope
+
+# The request scheme, host, method, path and query string.
+PrimaryKey = Tuple[str, bytes, str, str, bytes]
+CacheKey = Tuple[PrimaryKey, Tuple[Tuple[bytes, bytes], ...]]
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+# The share of the function memory used for the cache when sized from the context.
+DEFAULT_MEMORY_FRACTION = 0.1
+# The directives allowing a shared cache to store the response to a request with an
+# `Authorization` header (RFC 9111, section 3.5).
+AUTHORIZED_DIRECTIVES = frozenset(("public", "s-maxage", "must-revalidate"))
+
+
+class CachedResponse:
+    __slots__ = ("response", "size", "stored_at", "expires_at")
+
+    def __init__(self, response: Response, max_age: int) -> None:
+        self.response = response
+        self.size = len(response["body"]) + sum(len(key) + len(value) for key, value in response["headers"])
+        self.stored_at = time.monotonic()
+        self.expires_at = self.stored_at + max_age
+
+
+def parse_cache_control(value: bytes) -> dict[str, str]:
+    directives = {}
+    for directive in value.decode("latin-1").split(","):
+        name, _, argument = directive.partition("=")
+        directives[name.strip().lower()] = argument.strip().strip('"')
+    return directives
+
+
+def get_primary_key(scope: Scope) -> PrimaryKey:
+    host = get_combined_header(scope["headers"], b"host") or b""
+    return scope["scheme"], host, scope["method"], scope["path"], scope["query_string"]
+
+
+class ResponseCache:
+    """
+    A least recently used cache for the responses to GET requests, shared by the
+    invocations handled by the same execution environment.
+
+    Responses are only cached if they are successful and have a `Cache-Control` header
+    with a `max-age` (or `s-maxage`) directive, for that many seconds, and no `no-store`,
+    `no-cache` or `private` directive. The requests are matched on the scheme, the host,
+    the path, the query string and the values of the request headers named in the `Vary`
+    response header.
+
+    As the cache is shared by all the callers, the responses to requests with an
+    `Authorization` header are only cached if they have a `public`, `s-maxage` or
+    `must-revalidate` directive, and those requests are never answered from the cache.
+
+    * **max_entries** - The maximum number of responses cached.
+    * **max_bytes** - The maximum size of the cached responses. Defaults to a tenth of
+    the function memory (`context.memory_limit_in_mb`), or 16 MB if it is not available.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self.vary: dict[PrimaryKey, tuple[bytes, ...]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, context: LambdaContext) -> None:
+        """Sizes the cache from the function memory, unless `max_bytes` is set."""
+        if self.max_bytes is not None:
+            return
+        memory_limit_in_mb = getattr(context, "memory_limit_in_mb", None)
+        if memory_limit_in_mb is None:
+            self.max_bytes = DEFAULT_MAX_BYTES
+        else:
+            self.max_bytes = int(int(memory_limit_in_mb) * 1024 * 1024 * DEFAULT_MEMORY_FRACTION)
+
+    def get_key(self, scope: Scope, primary_key: PrimaryKey) -> CacheKey | None:
+        vary = self.vary.get(primary_key)
+        if vary is None:
+            return None
+        return primary_key, tuple((name, get_combined_header(scope["headers"], name) or b"") for name in vary)
+
+    def get(self, scope: Scope) -> Response | None:
+        """Returns the cached response for the request, if any, with an `Age` header."""
+        if scope["method"] != "GET" or get_combined_header(scope["headers"], b"authorization") is not None:
+            return None
+
+        key = self.get_key(scope, get_primary_key(scope))
+        if key is not None:
+            entry = self.entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry.expires_at > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                response = entry.response
+                return {
+                    "status": response["status"],
+                    "headers": [*response["headers"], [b"age", str(int(now - entry.stored_at)).encode()]],
+                    "body": response["body"],
+                }
+            if entry is not None:
+                self.remove(key)
+
+        self.misses += 1
+        return None
+
+    def put(self, scope: Scope, response: Response) -> None:
+        """Caches the response to the request if it is cacheable."""
+        if scope["method"] != "GET" or response["status"] != 200:
+            return
+        if get_combined_header(response["headers"], b"set-cookie") is not None:
+            return
+
+        cache_control = get_combined_header(response["headers"], b"cache-control")
+        directives = parse_cache_control(cache_control) if cache_control is not None else {}
+        if directives.keys() & {"no-store", "no-cache", "private"}:
+            return
+        if get_combined_header(scope["headers"], b"authorization") is not None and not (
+            directives.keys() & AUTHORIZED_DIRECTIVES
+        ):
+            return
+        try:
+            max_age = int(directives.get("s-maxage") or directives["max-age"])
+        except (KeyError, ValueError):
+            return
+
+        vary_header = get_combined_header(response["headers"], b"vary") or b""
+        vary = tuple(sorted({name.strip().lower() for name in vary_header.split(b",") if name.strip()}))
+        if max_age <= 0 or b"*" in vary:
+            return
+
+        entry = CachedResponse(response, max_age)
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+
+        primary_key = get_primary_key(scope)
+        self.vary[primary_key] = vary
+        key = self.get_key(scope, primary_key)
+        assert key is not None
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = entry
+        self.size += entry.size
+        while len(self.entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+            self.remove(next(iter(self.entries)))
+        self.vary[primary_key] = vary
+
+    def remove(self, key: CacheKey) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+        # The other responses cached for the request, if any, are found again once one
+        # of them is cached again.
+        self.vary.pop(key[0], None)
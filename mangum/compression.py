@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import zlib
+from typing import Callable, Sequence
+
+from mangum.headers import get_combined_header, get_header
+from mangum.mime import is_text_mime_type
+from mangum.types import Response, Scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+GZIP_LEVEL = 6
+# Higher brotli qualities compress slightly better at a much higher CPU cost.
+BROTLI_QUALITY = 4
+
+
+def gzip_compress(body: bytes) -> bytes:
+    # The zlib gzip wrapper writes a zero modification time, so the output is stable
+    # for the same body.
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def brotli_compress(body: bytes) -> bytes:
+    compressed: bytes = brotli.compress(body, quality=BROTLI_QUALITY)
+    return compressed
+
+
+ENCODERS: dict[str, Callable[[bytes], bytes]] = {"gzip": gzip_compress}
+if brotli is not None:  # pragma: no branch
+    ENCODERS["br"] = brotli_compress
+
+
+def get_accepted_encodings(accept_encoding: str) -> list[str]:
+    """Returns the supported content codings accepted by an `Accept-Encoding` header,
+    excluding those with a quality value of zero.
+    """
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    wildcard_quality = qualities.get("*", 0.0)
+    return [encoding for encoding in ENCODERS if qualities.get(encoding, wildcard_quality) > 0]
+
+
+def compress_response(
+    response: Response,
+    scope: Scope,
+    *,
+    text_mime_types: Sequence[str],
+    minimum_size: int,
+) -> Response:
+    """Compresses the body of a text response with the cheapest encoding accepted by the
+    client, unless it is smaller than `minimum_size` bytes or is already encoded.
+
+    The compressed body is base64 encoded in the Lambda response while a text body is
+    returned as is, so the compressed body is only used if it is smaller once encoded.
+    """
+    body = response["body"]
+    headers = response["headers"]
+    if len(body) < minimum_size:
+        return response
+
+    # Partial responses are left as is, their range applies to the unencoded body.
+    if get_header(headers, b"content-encoding") is not None or get_header(headers, b"content-range") is not None:
+        return response
+
+    content_type = (get_header(headers, b"content-type") or b"").decode("latin-1")
+    if not is_text_mime_type(content_type, text_mime_types):
+        return response
+
+    cache_control = get_header(headers, b"cache-control")
+    if cache_control is not None and b"no-transform" in cache_control.lower():
+        return response
+
+    # The values of repeated Vary headers are all kept, in a single header.
+    vary = get_combined_header(headers, b"vary")
+    response_headers = [[key, value] for key, value in headers if key.lower() != b"vary"]
+    if vary is None:
+        response_headers.append([b"vary", b"accept-encoding"])
+    elif {name.strip().lower() for name in vary.split(b",")} & {b"accept-encoding", b"*"}:
+        response_headers.append([b"vary", vary])
+    else:
+        response_headers.append([b"vary", vary + b", accept-encoding"])
+
+    accept_encoding = get_header(scope["headers"], b"accept-encoding") or b""
+    encoding = None
+    compressed_body = body
+    for accepted_encoding in get_accepted_encodings(accept_encoding.decode("latin-1")):
+        candidate = ENCODERS[accepted_encoding](body)
+        if len(candidate) < len(compressed_body):
+            encoding, compressed_body = accepted_encoding, candidate
+
+    if encoding is None or math.ceil(len(compressed_body) / 3) * 4 >= len(body):
+        return {"status": response["status"], "headers": response_headers, "body": body}
+
+    if get_header(response_headers, b"content-length") is not None:
+        response_headers = [[key, value] for key, value in response_headers if key.lower() != b"content-length"]
+        response_headers.append([b"content-length", str(len(compressed_body)).encode()])
+    response_headers.append([b"content-encoding", encoding.encode()])
+    return {"status": response["status"], "headers": response_headers, "body": compressed_body}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+
+from mangum.headers import get_header
+from mangum.types import Response, Scope
+
+# The headers sent with a `304 Not Modified` response, as they would have been sent
+# with a `200 OK` response. The content type is kept so that the caches refreshing the
+# stored headers from the response (and the default content type of some handlers) do
+# not replace it.
+NOT_MODIFIED_HEADERS = (
+    b"cache-control",
+    b"content-location",
+    b"content-type",
+    b"date",
+    b"etag",
+    b"expires",
+    b"vary",
+)
+
+
+def add_etag(response: Response) -> Response:
+    """Adds a strong ETag computed from the body to a successful response, unless the
+    application has set one.
+    """
+    if response["status"] != 200 or get_header(response["headers"], b"etag") is not None:
+        return response
+
+    etag = b'"%s"' % hashlib.blake2b(response["body"], digest_size=16).hexdigest().encode()
+    return {"status": response["status"], "headers": [*response["headers"], [b"etag", etag]], "body": response["body"]}
+
+
+def is_not_modified(scope: Scope, response: Response) -> bool:
+    """Returns whether the ETag of the response matches the `If-None-Match` header of
+    the request, using the weak comparison.
+    """
+    if scope["method"] not in ("GET", "HEAD") or response["status"] != 200:
+        return False
+
+    etag = get_header(response["headers"], b"etag")
+    if_none_match = get_header(scope["headers"], b"if-none-match")
+    if etag is None or if_none_match is None:
+        return False
+    if if_none_match.strip() == b"*":
+        return True
+
+    opaque_tag = etag.strip().split(b"W/", 1)[-1]
+    return any(tag.strip().split(b"W/", 1)[-1] == opaque_tag for tag in if_none_match.split(b","))
+
+
+def get_not_modified_response(response: Response) -> Response:
+    headers = [[key, value] for key, value in response["headers"] if key.lower() in NOT_MODIFIED_HEADERS]
+    return {"status": 304, "headers": headers, "body": b""}
@@ -1,5 +1,21 @@
 from mangum.handlers.alb import ALB
 from mangum.handlers.api_gateway import APIGateway, HTTPGateway
+from mangum.handlers.batch import BatchHandler
+from mangum.handlers.http_batch import HTTPBatch
 from mangum.handlers.lambda_at_edge import LambdaAtEdge
+from mangum.handlers.sqs import SQS
+from mangum.handlers.streams import DynamoDBStreams, Kinesis
+from mangum.handlers.websocket import APIGatewayWebSocket
 
-__all__ = ["APIGateway", "HTTPGateway", "ALB", "LambdaAtEdge"]
+__all__ = [
+    "APIGateway",
+    "HTTPGateway",
+    "ALB",
+    "LambdaAtEdge",
+    "BatchHandler",
+    "SQS",
+    "Kinesis",
+    "DynamoDBStreams",
+    "APIGatewayWebSocket",
+    "HTTPBatch",
+]
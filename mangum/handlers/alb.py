@@ -1,89 +1,90 @@
 from __future__ import annotations
 
-from itertools import islice
-from typing import Any, Generator
-from urllib.parse import unquote, unquote_plus, urlencode
+import logging
+from functools import lru_cache
+from typing import Any, Iterator
+from urllib.parse import unquote
 
 from mangum.handlers.utils import (
+    get_body_headers,
     get_server_and_port,
     handle_base64_response_body,
-    handle_exclude_headers,
+    iter_body_chunks,
     maybe_encode_body,
 )
+from mangum.headers import ENCODED_HEADER_NAMES, decode_headers, encode_header_value, encode_headers
+from mangum.query_string import get_query_string
 from mangum.types import (
     LambdaConfig,
     LambdaContext,
     LambdaEvent,
-    QueryParams,
     Response,
     Scope,
 )
 
+logger = logging.getLogger("mangum.alb")
 
-def all_casings(input_string: str) -> Generator[str, None, None]:
-    """
-    Permute all casings of a given string.
-    A pretty algoritm, via @Amber
-    http://stackoverflow.com/questions/6792803/finding-all-possible-case-permutations-in-python
+
+@lru_cache(maxsize=256)
+def get_casings(key: str, count: int) -> tuple[str, ...]:
+    """Returns up to `count` distinct casings of a lower-cased key. The casing of the
+    first letter changes first, then that of the second letter, and so on.
     """
-    if not input_string:
-        yield ""
-    else:
-        first = input_string[:1]
-        if first.lower() == first.upper():
-            for sub_casing in all_casings(input_string[1:]):
-                yield first + sub_casing
-        else:
-            for sub_casing in all_casings(input_string[1:]):
-                yield first.lower() + sub_casing
-                yield first.upper() + sub_casing
+    letter_indexes = [index for index, char in enumerate(key) if char.lower() != char.upper()]
+    count = min(count, 2 ** len(letter_indexes))
+    casings = []
+    for mask in range(count):
+        chars = list(key)
+        for bit, index in enumerate(letter_indexes):
+            if mask >> bit & 1:
+                chars[index] = chars[index].upper()
+        casings.append("".join(chars))
+    return tuple(casings)
 
 
 def case_mutated_headers(multi_value_headers: dict[str, list[str]]) -> dict[str, str]:
     """Create str/str key/value headers, with duplicate keys case mutated."""
     headers: dict[str, str] = {}
     for key, values in multi_value_headers.items():
-        if len(values) > 0:
-            casings = list(islice(all_casings(key), len(values)))
-            for value, cased_key in zip(values, casings):
-                headers[cased_key] = value
+        if len(values) == 1:
+            headers[key] = values[0]
+            continue
+
+        casings = get_casings(key, len(values))
+        if len(casings) < len(values):
+            logger.warning(
+                "The %s header has too few casings to return %d values, the last values are combined.",
+                key,
+                len(values),
+            )
+            values = [*values[: len(casings) - 1], ", ".join(values[len(casings) - 1 :])]
+        headers.update(zip(casings, values))
     return headers
 
 
-def encode_query_string_for_alb(params: QueryParams) -> bytes:
-    """Encode the query string parameters for the ALB event. The parameters must be
-    decoded and then encoded again to prevent double encoding.
-
-    According to the docs:
-
-        "If the query parameters are URL-encoded, the load balancer does not decode
-        "them. You must decode them in your Lambda function."
+def transform_headers(event: LambdaEvent) -> tuple[list[list[bytes]], dict[str, str]]:
+    """Returns the ASGI headers along with the unique lower-cased headers. If there are
+    duplicates, the unique headers use the last defined value.
     """
-    params = {
-        unquote_plus(key): (
-            unquote_plus(value) if isinstance(value, str) else tuple(unquote_plus(element) for element in value)
-        )
-        for key, value in params.items()
-    }
-    query_string = urlencode(params, doseq=True).encode()
-
-    return query_string
-
-
-def transform_headers(event: LambdaEvent) -> list[tuple[bytes, bytes]]:
-    headers: list[tuple[bytes, bytes]] = []
+    headers: list[list[bytes]] = []
+    uq_headers: dict[str, str] = {}
     if "multiValueHeaders" in event:
         for k, v in event["multiValueHeaders"].items():
+            lower_key = k.lower()
+            encoded_key = ENCODED_HEADER_NAMES.get(lower_key) or encode_header_value(lower_key)
             for inner_v in v:
-                headers.append((k.lower().encode(), inner_v.encode()))
+                headers.append([encoded_key, encode_header_value(inner_v)])
+                uq_headers[lower_key] = inner_v
     else:
-        for k, v in event["headers"].items():
-            headers.append((k.lower().encode(), v.encode()))
+        uq_headers = {k.lower(): v for k, v in event["headers"].items()}
+        headers = encode_headers(uq_headers)
 
-    return headers
+    return headers, uq_headers
 
 
 class ALB:
+    required_keys = frozenset(("requestContext",))
+
     @classmethod
     def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
         return "requestContext" in event and "elb" in event["requestContext"]
@@ -92,33 +93,45 @@ class ALB:
         self.event = event
         self.context = context
         self.config = config
+        # You must use multiValueHeaders if you have enabled multi-value headers and
+        # headers otherwise.
+        self.multi_value_headers_enabled = "multiValueHeaders" in event
+        self._scope: Scope | None = None
+        self._body: bytes | None = None
 
     @property
     def body(self) -> bytes:
-        return maybe_encode_body(
-            self.event.get("body", b""),
+        if self._body is None:
+            self._body = maybe_encode_body(
+                self.event.get("body", b""),
+                is_base64=self.event.get("isBase64Encoded", False),
+            )
+
+        return self._body
+
+    def iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        return iter_body_chunks(
+            self.event.get("body"),
             is_base64=self.event.get("isBase64Encoded", False),
+            chunk_size=chunk_size,
         )
 
     @property
     def scope(self) -> Scope:
-        headers = transform_headers(self.event)
-        list_headers = [list(x) for x in headers]
-        # Unique headers. If there are duplicates, it will use the last defined.
-        uq_headers = {k.decode(): v.decode() for k, v in headers}
+        if self._scope is None:
+            self._scope = self.build_scope()
+
+        return self._scope
+
+    def build_scope(self) -> Scope:
+        list_headers, uq_headers = transform_headers(self.event)
         source_ip = uq_headers.get("x-forwarded-for", "")
         path = unquote(self.event["path"]) if self.event["path"] else "/"
         http_method = self.event["httpMethod"]
 
-        params = self.event.get(
-            "multiValueQueryStringParameters",
-            self.event.get("queryStringParameters", {}),
-        )
-        if not params:
-            query_string = b""
-        else:
-            query_string = encode_query_string_for_alb(params)
-
+        # The load balancer does not decode URL-encoded query parameters, they are
+        # decoded before they are encoded again to prevent double encoding.
+        query_string = get_query_string(self.event, decode=True)
         server = get_server_and_port(uq_headers)
         client = (source_ip, 0)
 
@@ -142,16 +155,21 @@ class ALB:
         return scope
 
     def __call__(self, response: Response) -> dict[str, Any]:
+        exclude_headers = self.config["exclude_headers"]
         multi_value_headers: dict[str, list[str]] = {}
-        for key, value in response["headers"]:
-            lower_key = key.decode().lower()
-            if lower_key not in multi_value_headers:
-                multi_value_headers[lower_key] = []
-            multi_value_headers[lower_key].append(value.decode())
+        for lower_key, value in decode_headers(response["headers"]):
+            if lower_key in exclude_headers:
+                continue
+            if lower_key in multi_value_headers:
+                multi_value_headers[lower_key].append(value)
+            else:
+                multi_value_headers[lower_key] = [value]
 
         finalized_headers = case_mutated_headers(multi_value_headers)
         finalized_body, is_base64_encoded = handle_base64_response_body(
-            response["body"], finalized_headers, self.config["text_mime_types"]
+            response["body"],
+            get_body_headers(response["headers"], finalized_headers, exclude_headers),
+            self.config["text_mime_types"],
         )
 
         out = {
@@ -160,12 +178,9 @@ class ALB:
             "isBase64Encoded": is_base64_encoded,
         }
 
-        # You must use multiValueHeaders if you have enabled multi-value headers and
-        # headers otherwise.
-        multi_value_headers_enabled = "multiValueHeaders" in self.scope["aws.event"]
-        if multi_value_headers_enabled:
-            out["multiValueHeaders"] = handle_exclude_headers(multi_value_headers, self.config)
+        if self.multi_value_headers_enabled:
+            out["multiValueHeaders"] = multi_value_headers
         else:
-            out["headers"] = handle_exclude_headers(finalized_headers, self.config)
+            out["headers"] = finalized_headers
 
         return out
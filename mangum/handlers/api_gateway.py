@@ -1,37 +1,28 @@
 from __future__ import annotations
 
-from typing import Any
-from urllib.parse import urlencode
+from typing import Any, Collection, Iterator
 
 from mangum.handlers.utils import (
+    get_body_headers,
     get_server_and_port,
     handle_base64_response_body,
-    handle_exclude_headers,
     handle_multi_value_headers,
+    iter_body_chunks,
     maybe_encode_body,
     strip_api_gateway_path,
 )
+from mangum.headers import decode_headers, encode_headers
+from mangum.query_string import get_query_string
 from mangum.types import (
     Headers,
     LambdaConfig,
     LambdaContext,
     LambdaEvent,
-    QueryParams,
     Response,
     Scope,
 )
 
 
-def _encode_query_string_for_apigw(event: LambdaEvent) -> bytes:
-    params: QueryParams = event.get("multiValueQueryStringParameters", {})
-    if not params:
-        params = event.get("queryStringParameters", {})
-    if not params:
-        return b""
-
-    return urlencode(params, doseq=True).encode()
-
-
 def _handle_multi_value_headers_for_request(event: LambdaEvent) -> dict[str, str]:
     headers = event.get("headers", {}) or {}
     headers = {k.lower(): v for k, v in headers.items()}
@@ -48,12 +39,13 @@ def _handle_multi_value_headers_for_request(event: LambdaEvent) -> dict[str, str
 
 def _combine_headers_v2(
     input_headers: Headers,
+    exclude_headers: Collection[str] = (),
 ) -> tuple[dict[str, str], list[str]]:
     output_headers: dict[str, str] = {}
     cookies: list[str] = []
-    for key, value in input_headers:
-        normalized_key: str = key.decode().lower()
-        normalized_value: str = value.decode()
+    for normalized_key, normalized_value in decode_headers(input_headers):
+        if normalized_key in exclude_headers:
+            continue
         if normalized_key == "set-cookie":
             cookies.append(normalized_value)
         else:
@@ -65,6 +57,8 @@ def _combine_headers_v2(
 
 
 class APIGateway:
+    required_keys = frozenset(("resource", "requestContext"))
+
     @classmethod
     def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
         return "resource" in event and "requestContext" in event
@@ -73,22 +67,40 @@ class APIGateway:
         self.event = event
         self.context = context
         self.config = config
+        self._scope: Scope | None = None
+        self._body: bytes | None = None
 
     @property
     def body(self) -> bytes:
-        return maybe_encode_body(
-            self.event.get("body", b""),
+        if self._body is None:
+            self._body = maybe_encode_body(
+                self.event.get("body", b""),
+                is_base64=self.event.get("isBase64Encoded", False),
+            )
+
+        return self._body
+
+    def iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        return iter_body_chunks(
+            self.event.get("body"),
             is_base64=self.event.get("isBase64Encoded", False),
+            chunk_size=chunk_size,
         )
 
     @property
     def scope(self) -> Scope:
+        if self._scope is None:
+            self._scope = self.build_scope()
+
+        return self._scope
+
+    def build_scope(self) -> Scope:
         headers = _handle_multi_value_headers_for_request(self.event)
         return {
             "type": "http",
             "http_version": "1.1",
             "method": self.event["httpMethod"],
-            "headers": [[k.encode(), v.encode()] for k, v in headers.items()],
+            "headers": encode_headers(headers),
             "path": strip_api_gateway_path(
                 self.event["path"],
                 api_gateway_base_path=self.config["api_gateway_base_path"],
@@ -96,7 +108,7 @@ class APIGateway:
             "raw_path": None,
             "root_path": "",
             "scheme": headers.get("x-forwarded-proto", "https"),
-            "query_string": _encode_query_string_for_apigw(self.event),
+            "query_string": get_query_string(self.event),
             "server": get_server_and_port(headers),
             "client": (
                 self.event["requestContext"].get("identity", {}).get("sourceIp"),
@@ -108,21 +120,26 @@ class APIGateway:
         }
 
     def __call__(self, response: Response) -> dict[str, Any]:
-        finalized_headers, multi_value_headers = handle_multi_value_headers(response["headers"])
+        exclude_headers = self.config["exclude_headers"]
+        finalized_headers, multi_value_headers = handle_multi_value_headers(response["headers"], exclude_headers)
         finalized_body, is_base64_encoded = handle_base64_response_body(
-            response["body"], finalized_headers, self.config["text_mime_types"]
+            response["body"],
+            get_body_headers(response["headers"], finalized_headers, exclude_headers),
+            self.config["text_mime_types"],
         )
 
         return {
             "statusCode": response["status"],
-            "headers": handle_exclude_headers(finalized_headers, self.config),
-            "multiValueHeaders": handle_exclude_headers(multi_value_headers, self.config),
+            "headers": finalized_headers,
+            "multiValueHeaders": multi_value_headers,
             "body": finalized_body,
             "isBase64Encoded": is_base64_encoded,
         }
 
 
 class HTTPGateway:
+    required_keys = frozenset(("version", "requestContext"))
+
     @classmethod
     def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
         return "version" in event and "requestContext" in event
@@ -131,26 +148,44 @@ class HTTPGateway:
         self.event = event
         self.context = context
         self.config = config
+        self.is_v2 = event["version"] == "2.0"
+        self._scope: Scope | None = None
+        self._body: bytes | None = None
 
     @property
     def body(self) -> bytes:
-        return maybe_encode_body(
-            self.event.get("body", b""),
+        if self._body is None:
+            self._body = maybe_encode_body(
+                self.event.get("body", b""),
+                is_base64=self.event.get("isBase64Encoded", False),
+            )
+
+        return self._body
+
+    def iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        return iter_body_chunks(
+            self.event.get("body"),
             is_base64=self.event.get("isBase64Encoded", False),
+            chunk_size=chunk_size,
         )
 
     @property
     def scope(self) -> Scope:
+        if self._scope is None:
+            self._scope = self.build_scope()
+
+        return self._scope
+
+    def build_scope(self) -> Scope:
         request_context = self.event["requestContext"]
-        event_version = self.event["version"]
 
         # API Gateway v2
-        if event_version == "2.0":
+        if self.is_v2:
             headers = {k.lower(): v for k, v in self.event.get("headers", {}).items()}
             source_ip = request_context["http"]["sourceIp"]
             path = request_context["http"]["path"]
             http_method = request_context["http"]["method"]
-            query_string = self.event.get("rawQueryString", "").encode()
+            query_string = get_query_string(self.event)
 
             if self.event.get("cookies"):
                 headers["cookie"] = "; ".join(self.event.get("cookies", []))
@@ -161,7 +196,7 @@ class HTTPGateway:
             source_ip = request_context.get("identity", {}).get("sourceIp")
             path = self.event["path"]
             http_method = self.event["httpMethod"]
-            query_string = _encode_query_string_for_apigw(self.event)
+            query_string = get_query_string(self.event)
 
         path = strip_api_gateway_path(
             path,
@@ -174,7 +209,7 @@ class HTTPGateway:
             "type": "http",
             "method": http_method,
             "http_version": "1.1",
-            "headers": [[k.encode(), v.encode()] for k, v in headers.items()],
+            "headers": encode_headers(headers),
             "path": path,
             "raw_path": None,
             "root_path": "",
@@ -188,14 +223,21 @@ class HTTPGateway:
         }
 
     def __call__(self, response: Response) -> dict[str, Any]:
-        if self.scope["aws.event"]["version"] == "2.0":
-            finalized_headers, cookies = _combine_headers_v2(response["headers"])
-
-            if "content-type" not in finalized_headers and response["body"] is not None:
+        exclude_headers = self.config["exclude_headers"]
+        if self.is_v2:
+            finalized_headers, cookies = _combine_headers_v2(response["headers"], exclude_headers)
+
+            if (
+                "content-type" not in finalized_headers
+                and "content-type" not in exclude_headers
+                and response["body"] is not None
+            ):
                 finalized_headers["content-type"] = "application/json"
 
             finalized_body, is_base64_encoded = handle_base64_response_body(
-                response["body"], finalized_headers, self.config["text_mime_types"]
+                response["body"],
+                get_body_headers(response["headers"], finalized_headers, exclude_headers),
+                self.config["text_mime_types"],
             )
             response_out = {
                 "statusCode": response["status"],
@@ -206,9 +248,11 @@ class HTTPGateway:
             }
             return {key: value for key, value in response_out.items() if value is not None}
 
-        finalized_headers, multi_value_headers = handle_multi_value_headers(response["headers"])
+        finalized_headers, multi_value_headers = handle_multi_value_headers(response["headers"], exclude_headers)
         finalized_body, is_base64_encoded = handle_base64_response_body(
-            response["body"], finalized_headers, self.config["text_mime_types"]
+            response["body"],
+            get_body_headers(response["headers"], finalized_headers, exclude_headers),
+            self.config["text_mime_types"],
         )
         return {
             "statusCode": response["status"],
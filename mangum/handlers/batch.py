@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import abc
+from typing import Any
+
+from mangum.headers import encode_headers
+from mangum.types import BatchRequest, LambdaConfig, LambdaContext, LambdaEvent, Response, Scope
+
+
+class BatchHandler(abc.ABC):
+    """
+    The base class of the handlers for events carrying a batch of records. Each record is
+    sent to the application as a `POST` request to the route of the event source, and the
+    records whose request did not succeed (or was not run) are reported as
+    `batchItemFailures`, so that only those are retried.
+
+    Subclasses implement `build_requests`, the events are inferred from the event source
+    of their first record.
+    """
+
+    # The event source of the records, and the path they are sent to unless another is
+    # configured in the `event_routes` of the adapter.
+    event_source = ""
+    route = "/"
+    required_keys = frozenset(("Records",))
+
+    def __init__(self, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> None:
+        self.event = event
+        self.context = context
+        self.config = config
+        self._requests: list[BatchRequest] | None = None
+
+    @classmethod
+    def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
+        records = event.get("Records") or [{}]
+        return bool(records[0].get("eventSource") == cls.event_source)
+
+    @property
+    def requests(self) -> list[BatchRequest]:
+        if self._requests is None:
+            self._requests = self.build_requests()
+
+        return self._requests
+
+    @abc.abstractmethod
+    def build_requests(self) -> list[BatchRequest]:
+        """Returns the requests made for the records of the event, in order."""
+
+    @property
+    def path(self) -> str:
+        return self.config["event_routes"].get(self.event_source, self.route)
+
+    def build_scope(self, record: dict[str, Any], headers: dict[str, str]) -> Scope:
+        return {
+            "type": "http",
+            "method": "POST",
+            "http_version": "1.1",
+            "headers": encode_headers(headers),
+            "path": self.path,
+            "raw_path": None,
+            "root_path": "",
+            "scheme": "https",
+            "query_string": b"",
+            "server": ("mangum", 80),
+            "client": None,
+            "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "aws.event": self.event,
+            "aws.context": self.context,
+            "aws.record": record,
+        }
+
+    def __call__(self, responses: list[Response | None]) -> dict[str, Any]:
+        return {
+            "batchItemFailures": [
+                {"itemIdentifier": request["id"]}
+                for request, response in zip(self.requests, responses)
+                if response is None or not 200 <= response["status"] < 300
+            ]
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Any
+
+from mangum.handlers.batch import BatchHandler
+from mangum.handlers.utils import (
+    get_body_headers,
+    get_server_and_port,
+    handle_base64_response_body,
+    handle_multi_value_headers,
+    maybe_encode_body,
+    strip_api_gateway_path,
+)
+from mangum.query_string import get_query_string
+from mangum.types import BatchRequest, LambdaConfig, LambdaContext, LambdaEvent, Response
+
+
+class HTTPBatch(BatchHandler):
+    """
+    Handles an event carrying a list of HTTP requests, so that many small requests are
+    made in a single invocation. The requests are run concurrently, and the response to
+    each one is returned in the same order:
+
+        {"requests": [{"id": "1", "method": "GET", "path": "/items/1"}, ...]}
+        {"responses": [{"id": "1", "statusCode": 200, "headers": {...}, "body": "..."}, ...]}
+
+    A request may also have `headers`, `queryStringParameters` (or
+    `multiValueQueryStringParameters`), a `body` and `isBase64Encoded`, as in an API
+    Gateway event. Its `id` defaults to its index in the list. A request that cannot be
+    parsed is returned with a `400` status, and the requests not completed before the
+    invocation deadline with a `504` status.
+    """
+
+    event_source = "batch"
+    required_keys = frozenset(("requests",))
+
+    @classmethod
+    def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
+        return isinstance(event.get("requests"), list)
+
+    def __init__(self, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> None:
+        super().__init__(event, context, config)
+        # The ids of the requests that could not be parsed, by index.
+        self.invalid_requests: dict[int, str] = {}
+
+    def build_requests(self) -> list[BatchRequest]:
+        requests: list[BatchRequest] = []
+        for index, request in enumerate(self.event["requests"]):
+            try:
+                requests.append(self.build_request(index, request))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                request_id = request.get("id", index) if isinstance(request, dict) else index
+                self.invalid_requests[index] = str(request_id)
+
+        return requests
+
+    def build_request(self, index: int, request: dict[str, Any]) -> BatchRequest:
+        headers = {key.lower(): value for key, value in (request.get("headers") or {}).items()}
+        scope = self.build_scope(request, headers)
+        scope.update(
+            {
+                "method": request.get("method", "GET").upper(),
+                "path": strip_api_gateway_path(
+                    request["path"],
+                    api_gateway_base_path=self.config["api_gateway_base_path"],
+                ),
+                "query_string": get_query_string(request),
+                "server": get_server_and_port(headers),
+            }
+        )
+        return {
+            "id": str(request.get("id", index)),
+            "scope": scope,
+            "body": maybe_encode_body(
+                request.get("body") or b"",
+                is_base64=request.get("isBase64Encoded", False),
+            ),
+            "group": None,
+        }
+
+    def __call__(self, responses: list[Response | None]) -> dict[str, Any]:
+        results = iter(zip(self.requests, responses))
+        out: list[dict[str, Any]] = []
+        for index in range(len(self.event["requests"])):
+            if index in self.invalid_requests:
+                out.append(self.get_error_response(self.invalid_requests[index], 400, "Invalid request descriptor."))
+                continue
+
+            request, response = next(results)
+            if response is None:
+                # The request was not completed before the invocation deadline.
+                out.append(self.get_error_response(request["id"], 504, ""))
+            else:
+                out.append({"id": request["id"], **self.finalize_response(response)})
+
+        return {"responses": out}
+
+    def get_error_response(self, request_id: str, status: int, body: str) -> dict[str, Any]:
+        headers = {"content-type": "text/plain; charset=utf-8"} if body else {}
+        return {
+            "id": request_id,
+            "statusCode": status,
+            "headers": headers,
+            "multiValueHeaders": {},
+            "body": body,
+            "isBase64Encoded": False,
+        }
+
+    def finalize_response(self, response: Response) -> dict[str, Any]:
+        exclude_headers = self.config["exclude_headers"]
+        finalized_headers, multi_value_headers = handle_multi_value_headers(response["headers"], exclude_headers)
+        finalized_body, is_base64_encoded = handle_base64_response_body(
+            response["body"],
+            get_body_headers(response["headers"], finalized_headers, exclude_headers),
+            self.config["text_mime_types"],
+        )
+        return {
+            "statusCode": response["status"],
+            "headers": finalized_headers,
+            "multiValueHeaders": multi_value_headers,
+            "body": finalized_body,
+            "isBase64Encoded": is_base64_encoded,
+        }
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from mangum.handlers.utils import (
     handle_base64_response_body,
-    handle_exclude_headers,
-    handle_multi_value_headers,
+    iter_body_chunks,
     maybe_encode_body,
 )
+from mangum.headers import decode_headers, encode_headers
 from mangum.types import LambdaConfig, LambdaContext, LambdaEvent, Response, Scope
 
 
 class LambdaAtEdge:
+    required_keys = frozenset(("Records",))
+
     @classmethod
     def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
         return "Records" in event and len(event["Records"]) > 0 and "cf" in event["Records"][0]
@@ -24,18 +26,38 @@ class LambdaAtEdge:
         self.event = event
         self.context = context
         self.config = config
+        self.cf_request = event["Records"][0]["cf"]["request"]
+        self._scope: Scope | None = None
+        self._body: bytes | None = None
 
     @property
     def body(self) -> bytes:
-        cf_request_body = self.event["Records"][0]["cf"]["request"].get("body", {})
-        return maybe_encode_body(
+        if self._body is None:
+            cf_request_body = self.cf_request.get("body", {})
+            self._body = maybe_encode_body(
+                cf_request_body.get("data"),
+                is_base64=cf_request_body.get("encoding", "") == "base64",
+            )
+
+        return self._body
+
+    def iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        cf_request_body = self.cf_request.get("body", {})
+        return iter_body_chunks(
             cf_request_body.get("data"),
             is_base64=cf_request_body.get("encoding", "") == "base64",
+            chunk_size=chunk_size,
         )
 
     @property
     def scope(self) -> Scope:
-        cf_request = self.event["Records"][0]["cf"]["request"]
+        if self._scope is None:
+            self._scope = self.build_scope()
+
+        return self._scope
+
+    def build_scope(self) -> Scope:
+        cf_request = self.cf_request
         scheme_header = cf_request["headers"].get("cloudfront-forwarded-proto", [{}])
         scheme = scheme_header[0].get("value", "https")
         host_header = cf_request["headers"].get("host", [{}])
@@ -55,7 +77,7 @@ class LambdaAtEdge:
             "type": "http",
             "method": http_method,
             "http_version": "1.1",
-            "headers": [[k.encode(), v[0]["value"].encode()] for k, v in cf_request["headers"].items()],
+            "headers": encode_headers({k: v[0]["value"] for k, v in cf_request["headers"].items()}),
             "path": cf_request["uri"],
             "raw_path": None,
             "root_path": "",
@@ -69,18 +91,18 @@ class LambdaAtEdge:
         }
 
     def __call__(self, response: Response) -> dict[str, Any]:
-        multi_value_headers, _ = handle_multi_value_headers(response["headers"])
+        headers = dict(decode_headers(response["headers"]))
         response_body, is_base64_encoded = handle_base64_response_body(
-            response["body"], multi_value_headers, self.config["text_mime_types"]
+            response["body"], headers, self.config["text_mime_types"]
         )
+        exclude_headers = self.config["exclude_headers"]
         finalized_headers: dict[str, list[dict[str, str]]] = {
-            key.decode().lower(): [{"key": key.decode().lower(), "value": val.decode()}]
-            for key, val in response["headers"]
+            key: [{"key": key, "value": value}] for key, value in headers.items() if key not in exclude_headers
         }
 
         return {
             "status": response["status"],
-            "headers": handle_exclude_headers(finalized_headers, self.config),
+            "headers": finalized_headers,
             "body": response_body,
             "isBase64Encoded": is_base64_encoded,
         }
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from mangum.handlers.batch import BatchHandler
+from mangum.types import BatchRequest
+
+
+class SQS(BatchHandler):
+    """
+    Sends the messages of an SQS event to the application, with the `Content-Type`
+    message attribute (if any) as the content type of the request. The messages of a
+    FIFO queue are run in order within each message group.
+    """
+
+    event_source = "aws:sqs"
+    route = "/sqs"
+
+    def build_requests(self) -> list[BatchRequest]:
+        requests: list[BatchRequest] = []
+        for record in self.event["Records"]:
+            headers: dict[str, str] = {}
+            for name, attribute in (record.get("messageAttributes") or {}).items():
+                if name.lower() == "content-type" and "stringValue" in attribute:
+                    headers["content-type"] = attribute["stringValue"]
+
+            requests.append(
+                {
+                    "id": record["messageId"],
+                    "scope": self.build_scope(record, headers),
+                    "body": (record.get("body") or "").encode(),
+                    "group": (record.get("attributes") or {}).get("MessageGroupId"),
+                }
+            )
+
+        return requests
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from mangum.handlers.batch import BatchHandler
+from mangum.types import BatchRequest, Response
+
+
+def deserialize_attribute_value(value: dict[str, Any]) -> Any:
+    """Converts a DynamoDB attribute value, such as `{"N": "1"}`, to a JSON value. Binary
+    values are kept base64 encoded.
+    """
+    (attribute_type, attribute_value), *_ = value.items()
+    if attribute_type == "N":
+        return int(attribute_value) if attribute_value.lstrip("-").isdigit() else float(attribute_value)
+    if attribute_type == "NS":
+        return [deserialize_attribute_value({"N": number}) for number in attribute_value]
+    if attribute_type == "NULL":
+        return None
+    if attribute_type == "L":
+        return [deserialize_attribute_value(element) for element in attribute_value]
+    if attribute_type == "M":
+        return deserialize_image(attribute_value)
+    # S, B, BOOL, SS and BS are the same in JSON.
+    return attribute_value
+
+
+def deserialize_image(image: dict[str, Any]) -> dict[str, Any]:
+    return {name: deserialize_attribute_value(value) for name, value in image.items()}
+
+
+class StreamHandler(BatchHandler):
+    """
+    The base class of the handlers for stream events. The records with the same key are
+    run one after the other in order, and the records with different keys concurrently.
+
+    Only the first failed record is reported, as the stream is checkpointed before it
+    and the following records are all retried, without retrying the records before it.
+    """
+
+    def __call__(self, responses: list[Response | None]) -> dict[str, Any]:
+        for request, response in zip(self.requests, responses):
+            if response is None or not 200 <= response["status"] < 300:
+                return {"batchItemFailures": [{"itemIdentifier": request["id"]}]}
+
+        return {"batchItemFailures": []}
+
+
+class Kinesis(StreamHandler):
+    """Sends the decoded data of the records of a Kinesis event to the application, in
+    order for each partition key.
+    """
+
+    event_source = "aws:kinesis"
+    route = "/kinesis"
+
+    def build_requests(self) -> list[BatchRequest]:
+        return [
+            {
+                "id": record["kinesis"]["sequenceNumber"],
+                "scope": self.build_scope(record, {}),
+                "body": base64.b64decode(record["kinesis"]["data"]),
+                "group": record["kinesis"]["partitionKey"],
+            }
+            for record in self.event["Records"]
+        ]
+
+
+class DynamoDBStreams(StreamHandler):
+    """
+    Sends the new images of the items of a DynamoDB Streams event to the application as
+    JSON, in order for each item. The body is empty if the record has no new image (for
+    a `REMOVE` event, or if the stream does not include them).
+    """
+
+    event_source = "aws:dynamodb"
+    route = "/dynamodb"
+
+    def build_requests(self) -> list[BatchRequest]:
+        requests: list[BatchRequest] = []
+        for record in self.event["Records"]:
+            dynamodb = record["dynamodb"]
+            new_image = dynamodb.get("NewImage")
+            if new_image is None:
+                headers, body = {}, b""
+            else:
+                headers, body = {"content-type": "application/json"}, json.dumps(deserialize_image(new_image)).encode()
+
+            requests.append(
+                {
+                    "id": dynamodb["SequenceNumber"],
+                    "scope": self.build_scope(record, headers),
+                    "body": body,
+                    "group": json.dumps(dynamodb["Keys"], sort_keys=True),
+                }
+            )
+
+        return requests
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import base64
-from typing import Any
+from typing import Any, Collection, Iterator, Sequence
 from urllib.parse import unquote
 
-from mangum.types import Headers, LambdaConfig
+from mangum.headers import decode_headers
+from mangum.mime import is_text_mime_type
+from mangum.types import Headers
+
+# The response headers that decide how the body is encoded.
+BODY_HEADERS = frozenset(("content-type", "content-encoding"))
 
 
 def maybe_encode_body(body: str | bytes, *, is_base64: bool) -> bytes:
@@ -17,6 +22,24 @@ def maybe_encode_body(body: str | bytes, *, is_base64: bool) -> bytes:
     return body
 
 
+def iter_body_chunks(body: str | bytes | None, *, is_base64: bool, chunk_size: int) -> Iterator[bytes]:
+    """Decodes the body lazily in chunks of `chunk_size` bytes (rounded down to a multiple
+    of three for base64 bodies, or `chunk_size` characters for text bodies).
+    """
+    body = body or b""
+    if is_base64:
+        # Every four base64 characters decode to three bytes.
+        step = max(chunk_size // 3, 1) * 4
+        for start in range(0, len(body), step):
+            yield base64.b64decode(body[start : start + step])
+    elif isinstance(body, str):
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size].encode()
+    else:
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+
 def get_server_and_port(headers: dict[str, Any]) -> tuple[str, int]:
     server_name = headers.get("host", "mangum")
     if ":" not in server_name:
@@ -33,8 +56,6 @@ def strip_api_gateway_path(path: str, *, api_gateway_base_path: str) -> str:
         return "/"
 
     if api_gateway_base_path and api_gateway_base_path != "/":
-        if not api_gateway_base_path.startswith("/"):
-            api_gateway_base_path = f"/{api_gateway_base_path}"
         if path.startswith(api_gateway_base_path):
             path = path[len(api_gateway_base_path) :]
 
@@ -43,53 +64,54 @@ def strip_api_gateway_path(path: str, *, api_gateway_base_path: str) -> str:
 
 def handle_multi_value_headers(
     response_headers: Headers,
+    exclude_headers: Collection[str] = (),
 ) -> tuple[dict[str, str], dict[str, list[str]]]:
     headers: dict[str, str] = {}
     multi_value_headers: dict[str, list[str]] = {}
-    for key, value in response_headers:
-        lower_key = key.decode().lower()
+    for lower_key, value in decode_headers(response_headers):
+        if lower_key in exclude_headers:
+            continue
         if lower_key in multi_value_headers:
-            multi_value_headers[lower_key].append(value.decode())
+            multi_value_headers[lower_key].append(value)
         elif lower_key in headers:
             # Move existing to multi_value_headers and append current
-            multi_value_headers[lower_key] = [
-                headers[lower_key],
-                value.decode(),
-            ]
-            del headers[lower_key]
+            multi_value_headers[lower_key] = [headers.pop(lower_key), value]
         else:
-            headers[lower_key] = value.decode()
+            headers[lower_key] = value
     return headers, multi_value_headers
 
 
+def get_body_headers(
+    response_headers: Headers, headers: dict[str, str], exclude_headers: Collection[str]
+) -> dict[str, str]:
+    """Returns the headers to encode the body with. The response headers are only decoded
+    again if one of the headers deciding the encoding was excluded from them.
+    """
+    if BODY_HEADERS.isdisjoint(exclude_headers):
+        return headers
+    return dict(decode_headers(response_headers))
+
+
 def handle_base64_response_body(
     body: bytes,
     headers: dict[str, str],
-    text_mime_types: list[str],
+    text_mime_types: Sequence[str],
 ) -> tuple[str, bool]:
     is_base64_encoded = False
     output_body = ""
     if body != b"":
-        for text_mime_type in text_mime_types:
-            if text_mime_type in headers.get("content-type", ""):
-                try:
-                    output_body = body.decode()
-                except UnicodeDecodeError:
-                    output_body = base64.b64encode(body).decode()
-                    is_base64_encoded = True
-                break
+        # An encoded body is binary regardless of the MIME type.
+        if headers.get("content-encoding", "identity") != "identity":
+            return base64.b64encode(body).decode(), True
+
+        if is_text_mime_type(headers.get("content-type", ""), text_mime_types):
+            try:
+                output_body = body.decode()
+            except UnicodeDecodeError:
+                output_body = base64.b64encode(body).decode()
+                is_base64_encoded = True
         else:
             output_body = base64.b64encode(body).decode()
             is_base64_encoded = True
 
     return output_body, is_base64_encoded
-
-
-def handle_exclude_headers(headers: dict[str, Any], config: LambdaConfig) -> dict[str, Any]:
-    finalized_headers = {}
-    for header_key, header_value in headers.items():
-        if header_key in config["exclude_headers"]:
-            continue
-        finalized_headers[header_key] = header_value
-
-    return finalized_headers
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any
+
+from mangum.handlers.api_gateway import _handle_multi_value_headers_for_request
+from mangum.handlers.utils import maybe_encode_body
+from mangum.headers import decode_headers, encode_headers
+from mangum.query_string import get_query_string
+from mangum.types import LambdaConfig, LambdaContext, LambdaEvent, Message, Response, Scope
+from mangum.websocket import Connection
+
+
+class APIGatewayWebSocket:
+    """
+    Handles the events of an API Gateway WebSocket API. The `$connect` event opens an
+    ASGI `websocket` connection, which is stored until the `$disconnect` event. The
+    messages of the events for the other routes (such as `$default`) are received by
+    the application on the stored connection.
+    """
+
+    # The path of the connections, unless another is configured in the `event_routes` of
+    # the adapter.
+    event_source = "websocket"
+    route = "/"
+    required_keys = frozenset(("requestContext",))
+
+    @classmethod
+    def infer(cls, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> bool:
+        request_context = event.get("requestContext") or {}
+        return "connectionId" in request_context and "eventType" in request_context
+
+    def __init__(self, event: LambdaEvent, context: LambdaContext, config: LambdaConfig) -> None:
+        self.event = event
+        self.context = context
+        self.config = config
+        self.request_context = event["requestContext"]
+
+    @property
+    def connection_id(self) -> str:
+        connection_id: str = self.request_context["connectionId"]
+        return connection_id
+
+    @property
+    def event_type(self) -> str:
+        event_type: str = self.request_context["eventType"]
+        return event_type
+
+    @property
+    def endpoint_url(self) -> str:
+        """The URL of the management API for the stage the event was received on."""
+        return f"https://{self.request_context['domainName']}/{self.request_context['stage']}"
+
+    @property
+    def connection(self) -> Connection:
+        """The metadata of the connection, from the `$connect` event."""
+        headers = _handle_multi_value_headers_for_request(self.event)
+        subprotocols = headers.get("sec-websocket-protocol", "")
+        return {
+            "path": self.config["event_routes"].get(self.event_source, self.route),
+            "query_string": get_query_string(self.event).decode("latin-1"),
+            "headers": [[key, value] for key, value in headers.items()],
+            "subprotocols": [subprotocol.strip() for subprotocol in subprotocols.split(",") if subprotocol.strip()],
+            "client": [self.request_context.get("identity", {}).get("sourceIp"), 0],
+            "server": [self.request_context.get("domainName", "mangum"), 443],
+        }
+
+    def build_scope(self, connection: Connection | None) -> Scope:
+        """Returns the scope of the stored connection. The scope is built from the event
+        if the connection is not stored, as for the `$connect` event.
+        """
+        if connection is None:
+            connection = self.connection
+        client_host, client_port = connection["client"]
+        server_host, server_port = connection["server"]
+        return {
+            "type": "websocket",
+            "http_version": "1.1",
+            "headers": encode_headers(dict(connection["headers"])),
+            "path": connection["path"],
+            "raw_path": None,
+            "root_path": "",
+            "scheme": "wss",
+            "query_string": connection["query_string"].encode("latin-1"),
+            "server": (server_host, server_port),
+            "client": (client_host, client_port),
+            "subprotocols": connection["subprotocols"],
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "aws.event": self.event,
+            "aws.context": self.context,
+        }
+
+    @property
+    def message(self) -> Message | None:
+        """The `websocket.receive` message of the event, if it carries one."""
+        if self.event_type != "MESSAGE":
+            return None
+        body = self.event.get("body")
+        if self.event.get("isBase64Encoded", False):
+            return {"type": "websocket.receive", "bytes": maybe_encode_body(body or "", is_base64=True)}
+        return {"type": "websocket.receive", "text": body or ""}
+
+    @property
+    def close_code(self) -> int:
+        """The close code of the `$disconnect` event, or 1000 once the other events are
+        handled.
+        """
+        close_code: int = self.request_context.get("disconnectStatusCode") or 1000
+        return close_code
+
+    def __call__(self, response: Response) -> dict[str, Any]:
+        out: dict[str, Any] = {"statusCode": response["status"]}
+        if response["headers"]:
+            out["headers"] = dict(decode_headers(response["headers"]))
+        return out
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from mangum.types import Headers
+
+# Header names commonly found in requests and responses. Their encoded and decoded
+# forms are looked up rather than created for every header of every event.
+COMMON_HEADER_NAMES = (
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "access-control-allow-credentials",
+    "access-control-allow-headers",
+    "access-control-allow-methods",
+    "access-control-allow-origin",
+    "access-control-expose-headers",
+    "access-control-max-age",
+    "age",
+    "authorization",
+    "cache-control",
+    "cloudfront-forwarded-proto",
+    "cloudfront-is-desktop-viewer",
+    "cloudfront-is-mobile-viewer",
+    "cloudfront-is-smarttv-viewer",
+    "cloudfront-is-tablet-viewer",
+    "cloudfront-viewer-country",
+    "connection",
+    "content-disposition",
+    "content-encoding",
+    "content-language",
+    "content-length",
+    "content-location",
+    "content-range",
+    "content-security-policy",
+    "content-type",
+    "cookie",
+    "date",
+    "dnt",
+    "etag",
+    "expires",
+    "host",
+    "if-match",
+    "if-modified-since",
+    "if-none-match",
+    "if-range",
+    "last-modified",
+    "location",
+    "origin",
+    "permissions-policy",
+    "pragma",
+    "range",
+    "referer",
+    "referrer-policy",
+    "sec-ch-ua",
+    "sec-ch-ua-mobile",
+    "sec-ch-ua-platform",
+    "sec-fetch-dest",
+    "sec-fetch-mode",
+    "sec-fetch-site",
+    "sec-fetch-user",
+    "server",
+    "set-cookie",
+    "strict-transport-security",
+    "upgrade-insecure-requests",
+    "user-agent",
+    "vary",
+    "via",
+    "www-authenticate",
+    "x-amz-cf-id",
+    "x-amzn-trace-id",
+    "x-api-key",
+    "x-content-type-options",
+    "x-forwarded-for",
+    "x-forwarded-port",
+    "x-forwarded-proto",
+    "x-frame-options",
+    "x-request-id",
+    "x-xss-protection",
+)
+
+ENCODED_HEADER_NAMES: dict[str, bytes] = {name: name.encode("latin-1") for name in COMMON_HEADER_NAMES}
+DECODED_HEADER_NAMES: dict[bytes, str] = {encoded: name for name, encoded in ENCODED_HEADER_NAMES.items()}
+
+
+def encode_header_value(value: str) -> bytes:
+    """Encodes a header value as latin-1, or UTF-8 if it contains characters that cannot
+    be represented in latin-1.
+    """
+    try:
+        return value.encode("latin-1")
+    except UnicodeEncodeError:
+        return value.encode()
+
+
+def decode_header_value(value: bytes) -> str:
+    """Decodes a header value as UTF-8, or latin-1 if it is not valid UTF-8."""
+    try:
+        return value.decode()
+    except UnicodeDecodeError:
+        return value.decode("latin-1")
+
+
+def encode_headers(headers: Mapping[str, str]) -> Headers:
+    """Encodes headers with lower-cased names into ASGI headers."""
+    encoded_header_names = ENCODED_HEADER_NAMES
+    # ASCII is encoded the same as latin-1 and UTF-8, the UTF-8 codec being the fastest.
+    if "".join(headers.values()).isascii():
+        return [[encoded_header_names.get(name) or name.encode(), value.encode()] for name, value in headers.items()]
+
+    return [
+        [encoded_header_names.get(name) or encode_header_value(name), encode_header_value(value)]
+        for name, value in headers.items()
+    ]
+
+
+def decode_headers(headers: Headers) -> list[tuple[str, str]]:
+    """Decodes ASGI headers into lower-cased names and values."""
+    decoded_header_names = DECODED_HEADER_NAMES
+    try:
+        return [
+            (decoded_header_names.get(name) or name.decode("latin-1").lower(), value.decode())
+            for name, value in headers
+        ]
+    except UnicodeDecodeError:
+        return [
+            (decoded_header_names.get(name) or name.decode("latin-1").lower(), decode_header_value(value))
+            for name, value in headers
+        ]
+
+
+def get_header(headers: Headers, name: bytes) -> bytes | None:
+    """Returns the first value of a header in ASGI headers, if any."""
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def get_combined_header(headers: Headers, name: bytes) -> bytes | None:
+    """Returns the values of a header in ASGI headers, combined if it is repeated."""
+    values = [value for key, value in headers if key.lower() == name]
+    return b", ".join(values) if values else None
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from functools import lru_cache, wraps
+from typing import Any, Callable, Iterable, List, Sequence
+
+# Charsets not compatible with ASCII, a body in these is never valid UTF-8 text. A body in
+# any other charset is returned as text if it can be decoded as UTF-8.
+BINARY_CHARSET_PREFIXES = ("utf-16", "utf16", "utf-32", "utf32", "ucs-2", "ucs2", "ucs-4", "ucs4")
+
+
+def parse_content_type(content_type: str) -> tuple[str, str | None]:
+    """Returns the lower-cased media type and charset of a `Content-Type` header."""
+    media_type, _, params = content_type.partition(";")
+    charset = None
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip('"').lower()
+    return media_type.strip().lower(), charset
+
+
+class TextMimeTypes(List[str]):
+    """
+    The MIME types of responses returned as text rather than base64 encoded, compiled
+    into a classifier for `Content-Type` headers.
+
+    A content type is text if its media type starts with one of the MIME types (such as
+    `text/`), or, as before, contains one. Text in a charset that is not compatible with
+    ASCII (UTF-16 or UTF-32) is always base64 encoded, without first trying to decode the
+    body as UTF-8. The classification is remembered for each distinct `Content-Type`
+    header.
+    """
+
+    def __init__(self, text_mime_types: Iterable[str] = ()) -> None:
+        super().__init__(text_mime_types)
+        self.compile()
+
+    def compile(self) -> None:
+        self.patterns = tuple(self)
+        self.prefixes = tuple(text_mime_type.lower() for text_mime_type in self.patterns)
+        self.is_text = lru_cache(maxsize=256)(self.classify)
+
+    def classify(self, content_type: str) -> bool:
+        media_type, charset = parse_content_type(content_type)
+        if charset is not None and charset.startswith(BINARY_CHARSET_PREFIXES):
+            return False
+        if media_type.startswith(self.prefixes):
+            return True
+        return any(text_mime_type in content_type for text_mime_type in self.patterns)
+
+
+def _compile_after(method: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(self: TextMimeTypes, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        self.compile()
+        return result
+
+    return wrapper
+
+
+# The classifier is compiled again whenever the list is changed in place.
+for _method in (
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(TextMimeTypes, _method, _compile_after(getattr(list, _method)))
+
+
+@lru_cache(maxsize=16)
+def compile_text_mime_types(text_mime_types: tuple[str, ...]) -> TextMimeTypes:
+    return TextMimeTypes(text_mime_types)
+
+
+def is_text_mime_type(content_type: str, text_mime_types: Sequence[str]) -> bool:
+    """Returns whether a response with the content type is returned as text, compiling
+    the MIME types if they are not already.
+    """
+    if not isinstance(text_mime_types, TextMimeTypes):
+        text_mime_types = compile_text_mime_types(tuple(text_mime_types))
+    return text_mime_types.is_text(content_type)
@@ -1,4 +1,13 @@
+from .batch import BatchCycle
 from .http import HTTPCycle
 from .lifespan import LifespanCycle, LifespanCycleState
+from .websocket import WebSocketCycle, WebSocketCycleState
 
-__all__ = ["HTTPCycle", "LifespanCycleState", "LifespanCycle"]
+__all__ = [
+    "BatchCycle",
+    "HTTPCycle",
+    "LifespanCycleState",
+    "LifespanCycle",
+    "WebSocketCycle",
+    "WebSocketCycleState",
+]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Hashable
+
+from mangum.protocols.http import HTTPCycle, HTTPCycleState
+from mangum.types import ASGI, BatchRequest, Response
+
+logger = logging.getLogger("mangum.batch")
+
+
+class BatchCycle:
+    """
+    Runs the requests made for the records of a batch event concurrently on the event
+    loop, at most `concurrency` at a time.
+
+    The requests of a group are run one after the other in order, and the rest of the
+    group is skipped once a request fails, so that the records are retried in order.
+    The requests still running when the timeout (in seconds) expires are cancelled.
+    """
+
+    __slots__ = ("requests", "loop", "concurrency", "cycles", "deadline_reached")
+
+    def __init__(self, requests: list[BatchRequest], loop: asyncio.AbstractEventLoop, concurrency: int) -> None:
+        self.requests = requests
+        self.loop = loop
+        self.concurrency = concurrency
+        self.cycles: set[HTTPCycle] = set()
+        self.deadline_reached = False
+
+    def __call__(self, app: ASGI, timeout: float | None = None) -> list[Response | None]:
+        """Returns the response to each request, or `None` for the requests not run (or
+        cancelled) before the timeout.
+        """
+        responses: list[Response | None] = [None] * len(self.requests)
+        task = self.loop.create_task(self.run(app, responses))
+        done, _ = self.loop.run_until_complete(asyncio.wait({task}, timeout=timeout))
+        if not done:
+            self.deadline_reached = True
+            for cycle in self.cycles:
+                cycle.cancel()
+            self.loop.run_until_complete(asyncio.wait({task}))
+            logger.warning(
+                "%d of %d batch requests not run, the invocation deadline was reached.",
+                responses.count(None),
+                len(responses),
+            )
+        return responses
+
+    async def run(self, app: ASGI, responses: list[Response | None]) -> None:
+        groups: dict[Hashable, list[int]] = {}
+        for index, request in enumerate(self.requests):
+            group = request["group"]
+            groups.setdefault((index,) if group is None else group, []).append(index)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self.run_group(app, indexes, semaphore, responses) for indexes in groups.values()))
+
+    async def run_group(
+        self,
+        app: ASGI,
+        indexes: list[int],
+        semaphore: asyncio.Semaphore,
+        responses: list[Response | None],
+    ) -> None:
+        for index in indexes:
+            async with semaphore:
+                if self.deadline_reached:
+                    return
+                response = await self.run_request(app, self.requests[index])
+            responses[index] = response
+            if response is None or not 200 <= response["status"] < 300:
+                return
+
+    async def run_request(self, app: ASGI, request: BatchRequest) -> Response | None:
+        cycle = HTTPCycle(request["scope"], request["body"], self.loop)
+        cycle.app_task = self.loop.create_task(cycle.run(app))
+        self.cycles.add(cycle)
+        try:
+            await asyncio.wait({cycle.app_task})
+        finally:
+            self.cycles.discard(cycle)
+        if cycle.app_task.cancelled():
+            return None
+        if cycle.state is not HTTPCycleState.COMPLETE:
+            # The application returned without completing the response.
+            return {"status": 502, "headers": [[b"content-type", b"text/plain; charset=utf-8"]], "body": b"Bad Gateway"}
+        return cycle.response
@@ -1,10 +1,22 @@
+from __future__ import annotations
+
 import asyncio
 import enum
 import logging
-from io import BytesIO
+import mmap
+import os
+import time
+from typing import Iterator
 
 from mangum.exceptions import UnexpectedMessage
-from mangum.types import ASGI, Message, Response, Scope
+from mangum.types import ASGI, Message, Response, ResponseStream, Scope
+
+logger = logging.getLogger("mangum.http")
+
+# The extensions supported by the cycle, advertised in the `extensions` of the scope.
+EXTENSIONS = ("http.response.pathsend", "http.response.zerocopysend")
+# The size of the chunks a file is written to a response stream in.
+FILE_CHUNK_SIZE = 64 * 1024
 
 
 class HTTPCycleState(enum.Enum):
@@ -15,7 +27,7 @@ class HTTPCycleState(enum.Enum):
     * **RESPONSE** - The `http.response.start` event has been sent by the application.
     The next expected message is the `http.response.body` event, containing the body
     content. An application may pass the `more_body` argument to send content in chunks,
-    however content will always be returned in a single response, never streamed.
+    the content will be returned in a single response unless a response stream is used.
     * **COMPLETE** - The body content from the ASGI application has been completely
     read. A disconnect event will be sent to the application, and the response will
     be returned.
@@ -26,82 +38,244 @@ class HTTPCycleState(enum.Enum):
     COMPLETE = enum.auto()
 
 
+class HTTPRequestChannel:
+    """
+    Delivers the `http.request` messages for the request body to the application,
+    followed by `http.disconnect` once the response is complete.
+
+    The body is either delivered in a single message, or in chunks as they are
+    received by the application, one chunk ahead so the last `http.request` message has
+    `more_body` set to false.
+    """
+
+    __slots__ = ("request_message", "request_body", "next_body_chunk", "disconnected", "disconnect_waiter")
+
+    def __init__(self, body: bytes | Iterator[bytes]) -> None:
+        self.request_message: Message | None = None
+        self.request_body: Iterator[bytes] | None = None
+        self.next_body_chunk = b""
+        self.disconnected = False
+        self.disconnect_waiter: asyncio.Future[None] | None = None
+        if isinstance(body, bytes):
+            self.request_message = {"type": "http.request", "body": body, "more_body": False}
+        else:
+            self.request_body = body
+            self.next_body_chunk = next(body, b"")
+
+    async def receive(self) -> Message:
+        message = self.request_message
+        if message is not None:
+            self.request_message = None
+            return message
+
+        if self.request_body is not None:
+            body = self.next_body_chunk
+            next_body_chunk = next(self.request_body, None)
+            if next_body_chunk is None:
+                self.request_body = None
+            else:
+                self.next_body_chunk = next_body_chunk
+            return {"type": "http.request", "body": body, "more_body": self.request_body is not None}
+
+        if not self.disconnected:
+            # The waiter is only created for applications that wait for a disconnect.
+            self.disconnect_waiter = asyncio.get_running_loop().create_future()
+            await self.disconnect_waiter
+        return {"type": "http.disconnect"}
+
+    def disconnect(self) -> None:
+        self.disconnected = True
+        if self.disconnect_waiter is not None and not self.disconnect_waiter.done():
+            self.disconnect_waiter.set_result(None)
+
+
 class HTTPCycle:
-    def __init__(self, scope: Scope, body: bytes) -> None:
+    __slots__ = (
+        "scope",
+        "loop",
+        "stream",
+        "cancelled",
+        "app_task",
+        "response_complete",
+        "chunks",
+        "state",
+        "channel",
+        "status",
+        "headers",
+        "body",
+    )
+
+    def __init__(
+        self,
+        scope: Scope,
+        body: bytes | Iterator[bytes],
+        loop: asyncio.AbstractEventLoop,
+        stream: ResponseStream | None = None,
+    ) -> None:
         self.scope = scope
-        self.buffer = BytesIO()
+        extensions = scope.setdefault("extensions", {})
+        for extension in EXTENSIONS:
+            extensions.setdefault(extension, {})
+        self.loop = loop
+        self.stream = stream
+        self.cancelled = False
+        self.app_task: asyncio.Task[None] | None = None
+        self.response_complete: asyncio.Future[None] | None = None
+        self.chunks: list[bytes] = []
         self.state = HTTPCycleState.REQUEST
-        self.logger = logging.getLogger("mangum.http")
-        self.app_queue: asyncio.Queue[Message] = asyncio.Queue()
-        self.app_queue.put_nowait(
-            {
-                "type": "http.request",
-                "body": body,
-                "more_body": False,
-            }
-        )
+        self.channel = HTTPRequestChannel(body)
+
+    def __call__(self, app: ASGI, timeout: float | None = None, wait_for_app: bool = True) -> Response:
+        if timeout is None and wait_for_app:
+            self.loop.run_until_complete(self.run(app))
+        else:
+            self.run_until_response(app, timeout, wait_for_app)
 
-    def __call__(self, app: ASGI) -> Response:
-        asgi_instance = self.run(app)
-        loop = asyncio.get_event_loop()
-        asgi_task = loop.create_task(asgi_instance)
-        loop.run_until_complete(asgi_task)
+        return self.response
 
+    @property
+    def response(self) -> Response:
         return {
             "status": self.status,
             "headers": self.headers,
             "body": self.body,
         }
 
+    def run_until_response(self, app: ASGI, timeout: float | None, wait_for_app: bool) -> None:
+        """Runs the application until it returns, or only until the response is complete
+        if `wait_for_app` is false, in which case the remaining work is left running in
+        the `app_task`. If the timeout (in seconds) expires first, the application task is
+        cancelled and a 504 response is returned.
+        """
+        started = time.monotonic()
+        self.app_task = self.loop.create_task(self.run(app))
+        waiters: set[asyncio.Future[None]] = {self.app_task}
+        if not wait_for_app:
+            self.response_complete = self.loop.create_future()
+            waiters.add(self.response_complete)
+        self.loop.run_until_complete(asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED))
+        if self.app_task.done() or (self.state is HTTPCycleState.COMPLETE and not wait_for_app):
+            return
+
+        self.cancel()
+        self.loop.run_until_complete(asyncio.wait({self.app_task}))
+        logger.warning(
+            "%s %s cancelled after %.0f ms, the invocation deadline was reached.",
+            self.scope["method"],
+            self.scope["path"],
+            (time.monotonic() - started) * 1000,
+        )
+        self.loop.run_until_complete(self.send_error_response(504, b"Gateway Timeout"))
+
+    def cancel(self) -> None:
+        """Cancels the application task, if it is still running."""
+        if self.app_task is not None and not self.app_task.done():
+            self.cancelled = True
+            self.app_task.cancel()
+
     async def run(self, app: ASGI) -> None:
         try:
-            await app(self.scope, self.receive, self.send)
-        except BaseException:
-            self.logger.exception("An error occurred running the application.")
-            if self.state is HTTPCycleState.REQUEST:
-                await self.send(
-                    {
-                        "type": "http.response.start",
-                        "status": 500,
-                        "headers": [[b"content-type", b"text/plain; charset=utf-8"]],
-                    }
-                )
-                await self.send(
-                    {
-                        "type": "http.response.body",
-                        "body": b"Internal Server Error",
-                        "more_body": False,
-                    }
-                )
-            elif self.state is not HTTPCycleState.COMPLETE:
-                self.status = 500
-                self.body = b"Internal Server Error"
-                self.headers = [[b"content-type", b"text/plain; charset=utf-8"]]
+            await app(self.scope, self.channel.receive, self.send)
+        except BaseException as exc:
+            if self.cancelled and isinstance(exc, asyncio.CancelledError):
+                raise
+            logger.exception("An error occurred running the application.")
+            await self.send_error_response(500, b"Internal Server Error")
 
-    async def receive(self) -> Message:
-        return await self.app_queue.get()  # pragma: no cover
+    async def send_error_response(self, status: int, body: bytes) -> None:
+        if self.state is HTTPCycleState.REQUEST:
+            await self.send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": [[b"content-type", b"text/plain; charset=utf-8"]],
+                }
+            )
+            await self.send({"type": "http.response.body", "body": body, "more_body": False})
+        elif self.state is not HTTPCycleState.COMPLETE and self.stream is not None:
+            # The status and headers have already been streamed.
+            self.body = b""
+            self.stream.close()
+        elif self.state is not HTTPCycleState.COMPLETE:
+            self.status = status
+            self.body = body
+            self.headers = [[b"content-type", b"text/plain; charset=utf-8"]]
 
     async def send(self, message: Message) -> None:
-        if self.state is HTTPCycleState.REQUEST and message["type"] == "http.response.start":
+        message_type = message["type"]
+        if self.state is HTTPCycleState.REQUEST and message_type == "http.response.start":
             self.status = message["status"]
             self.headers = message.get("headers", [])
             self.state = HTTPCycleState.RESPONSE
-        elif self.state is HTTPCycleState.RESPONSE and message["type"] == "http.response.body":
+            if self.stream is not None:
+                self.stream.start(self.status, self.headers)
+        elif self.state is HTTPCycleState.RESPONSE and message_type == "http.response.body":
             body = message.get("body", b"")
-            more_body = message.get("more_body", False)
-            self.buffer.write(body)
-            if not more_body:
-                self.body = self.buffer.getvalue()
-                self.buffer.close()
-
-                self.state = HTTPCycleState.COMPLETE
-                await self.app_queue.put({"type": "http.disconnect"})
-
-                self.logger.info(
-                    "%s %s %s",
-                    self.scope["method"],
-                    self.scope["path"],
-                    self.status,
-                )
+            if self.stream is not None:
+                if body:
+                    self.stream.write(body)
+            elif body:
+                self.chunks.append(body)
+            if not message.get("more_body", False):
+                self.complete()
+        elif self.state is HTTPCycleState.RESPONSE and message_type == "http.response.pathsend":
+            with open(message["path"], "rb") as file:
+                self.send_file(file.fileno(), 0, None)
+            self.complete()
+        elif self.state is HTTPCycleState.RESPONSE and message_type == "http.response.zerocopysend":
+            file = message["file"]
+            self.send_file(
+                file if isinstance(file, int) else file.fileno(),
+                message.get("offset"),
+                message.get("count"),
+            )
+            if not message.get("more_body", False):
+                self.complete()
+        else:
+            raise UnexpectedMessage(f"Unexpected {message_type}")
+
+    def send_file(self, fd: int, offset: int | None, count: int | None) -> None:
+        """Adds `count` bytes of a file, from the `offset` or the current position, to the
+        response body. The file is mapped into memory, so a buffered body is copied from
+        the page cache in one go rather than read in chunks.
+        """
+        end = os.fstat(fd).st_size
+        if offset is None:
+            offset = os.lseek(fd, 0, os.SEEK_CUR)
+            if count is not None:
+                end = min(end, offset + count)
+            # Like a read, the current position is advanced past the bytes sent.
+            os.lseek(fd, max(end, offset), os.SEEK_SET)
+        elif count is not None:
+            end = min(end, offset + count)
+        if end <= offset:
+            return
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as file_map:
+            if self.stream is None:
+                self.chunks.append(file_map[offset:end])
+                return
+            for start in range(offset, end, FILE_CHUNK_SIZE):
+                self.stream.write(file_map[start : min(start + FILE_CHUNK_SIZE, end)])
+
+    def complete(self) -> None:
+        if self.stream is not None:
+            self.body = b""
+            self.stream.close()
         else:
-            raise UnexpectedMessage(f"Unexpected {message['type']}")
+            # Most applications send the body in a single message, which is
+            # then used as is rather than copied (`bytes` returns the same object).
+            self.body = bytes(self.chunks[0]) if len(self.chunks) == 1 else b"".join(self.chunks)
+        self.chunks.clear()
+
+        self.state = HTTPCycleState.COMPLETE
+        if self.response_complete is not None:
+            self.response_complete.set_result(None)
+        self.channel.disconnect()
+
+        logger.info(
+            "%s %s %s",
+            self.scope["method"],
+            self.scope["path"],
+            self.status,
+        )
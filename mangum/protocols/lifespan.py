@@ -42,6 +42,7 @@ class LifespanCycle:
     specification. This will usually be an ASGI framework application instance.
     * **lifespan** - A string to configure lifespan support. Choices are `auto`, `on`,
     and `off`. Default is `auto`.
+    * **loop** - The event loop used to run the application, owned by the adapter.
     * **state** - An enumerated `LifespanCycleState` type that indicates the state of
     the ASGI connection.
     * **exception** - An exception raised while handling the ASGI event. This may or
@@ -54,12 +55,12 @@ class LifespanCycle:
     shutdown flow.
     """
 
-    def __init__(self, app: ASGI, lifespan: LifespanMode) -> None:
+    def __init__(self, app: ASGI, lifespan: LifespanMode, loop: asyncio.AbstractEventLoop) -> None:
         self.app = app
         self.lifespan = lifespan
         self.state: LifespanCycleState = LifespanCycleState.CONNECTING
         self.exception: BaseException | None = None
-        self.loop = asyncio.get_event_loop()
+        self.loop = loop
         self.app_queue: asyncio.Queue[Message] = asyncio.Queue()
         self.startup_event: asyncio.Event = asyncio.Event()
         self.shutdown_event: asyncio.Event = asyncio.Event()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import logging
+
+from mangum.exceptions import UnexpectedMessage
+from mangum.types import ASGI, Headers, Message, Scope
+from mangum.websocket import OutgoingMessage
+
+logger = logging.getLogger("mangum.websocket")
+
+
+class WebSocketCycleState(enum.Enum):
+    """
+    The state of the ASGI `websocket` connection.
+
+    * **CONNECTING** - Initial state. The application has received (or will receive) the
+    `websocket.connect` event, and may accept or close the connection.
+    * **CONNECTED** - The connection has been accepted, by the application during the
+    `$connect` event, or by API Gateway for the later events.
+    * **CLOSED** - The connection has been closed (or denied) by the application.
+    """
+
+    CONNECTING = enum.auto()
+    CONNECTED = enum.auto()
+    CLOSED = enum.auto()
+
+
+class WebSocketCycle:
+    """
+    Runs the application for a single event of an API Gateway WebSocket connection.
+
+    The application receives `websocket.connect`, then the `websocket.receive` message
+    of the event if any, and then `websocket.disconnect` so that it returns once the
+    event is handled. The connection remains open between the events, unless the
+    `$disconnect` event is received or the application closes it.
+
+    The `websocket.send` messages are collected in `sent_messages`, to be posted to the
+    connection once the application has returned.
+    """
+
+    __slots__ = (
+        "scope",
+        "loop",
+        "messages",
+        "state",
+        "status",
+        "subprotocol",
+        "headers",
+        "sent_messages",
+    )
+
+    def __init__(
+        self,
+        scope: Scope,
+        message: Message | None,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        connected: bool,
+        close_code: int = 1000,
+    ) -> None:
+        self.scope = scope
+        self.loop = loop
+        self.messages: list[Message] = [{"type": "websocket.connect"}]
+        if message is not None:
+            self.messages.append(message)
+        self.messages.append({"type": "websocket.disconnect", "code": close_code})
+        self.messages.reverse()
+        self.state = WebSocketCycleState.CONNECTED if connected else WebSocketCycleState.CONNECTING
+        self.status = 200
+        self.subprotocol: str | None = None
+        self.headers: Headers = []
+        self.sent_messages: list[OutgoingMessage] = []
+
+    def __call__(self, app: ASGI, timeout: float | None = None) -> None:
+        app_task = self.loop.create_task(self.run(app))
+        done, _ = self.loop.run_until_complete(asyncio.wait({app_task}, timeout=timeout))
+        if not done:
+            app_task.cancel()
+            self.loop.run_until_complete(asyncio.wait({app_task}))
+            logger.warning("WebSocket %s cancelled, the invocation deadline was reached.", self.scope["path"])
+            self.status = 504
+
+    async def run(self, app: ASGI) -> None:
+        try:
+            await app(self.scope, self.receive, self.send)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            logger.exception("An error occurred running the application.")
+            self.status = 500
+
+    async def receive(self) -> Message:
+        if len(self.messages) > 1:
+            return self.messages.pop()
+        # The last message is the disconnect, received again if the application does.
+        return self.messages[0]
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if self.state is WebSocketCycleState.CONNECTING and message_type == "websocket.accept":
+            self.state = WebSocketCycleState.CONNECTED
+            self.subprotocol = message.get("subprotocol")
+            self.headers = list(message.get("headers", []))
+        elif self.state is WebSocketCycleState.CONNECTED and message_type == "websocket.accept":
+            # The connection was accepted during the `$connect` event.
+            pass
+        elif self.state is WebSocketCycleState.CONNECTED and message_type == "websocket.send":
+            text = message.get("text")
+            self.sent_messages.append(text if text is not None else message["bytes"])
+        elif self.state is not WebSocketCycleState.CLOSED and message_type == "websocket.close":
+            self.state = WebSocketCycleState.CLOSED
+        else:
+            raise UnexpectedMessage(f"Unexpected {message_type}")
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import string
+from functools import lru_cache
+from typing import Tuple, Union
+from urllib.parse import unquote_plus
+
+from mangum.types import LambdaEvent, QueryParams
+
+# The parameters as a hashable key, in the order of the event.
+QueryItems = Tuple[Tuple[str, Union[str, Tuple[str, ...]]], ...]
+
+# The characters `urllib.parse.quote_plus` never quotes.
+SAFE_CHARS = string.ascii_letters + string.digits + "_.-~"
+# The quoted form of every byte, as `urllib.parse.quote_plus` would produce it.
+QUOTED_BYTES = tuple(
+    chr(byte) if chr(byte) in SAFE_CHARS else "+" if byte == 0x20 else f"%{byte:02X}" for byte in range(256)
+)
+
+
+def quote_plus(value: str) -> str:
+    """Quotes a query string key or value, the same as `urllib.parse.quote_plus`."""
+    if not value.strip(SAFE_CHARS):
+        return value
+    quoted_bytes = QUOTED_BYTES
+    return "".join([quoted_bytes[byte] for byte in value.encode()])
+
+
+def requote_plus(value: str) -> str:
+    """Decodes a URL-encoded query string key or value and quotes it again."""
+    # A value made of safe characters only is the same once decoded and quoted again.
+    if not value.strip(SAFE_CHARS):
+        return value
+    return quote_plus(unquote_plus(value))
+
+
+@lru_cache(maxsize=256)
+def build_query_string(items: QueryItems, decode: bool) -> bytes:
+    quote = requote_plus if decode else quote_plus
+    pairs = []
+    for key, value in items:
+        quoted_key = quote(key)
+        if isinstance(value, str):
+            pairs.append(f"{quoted_key}={quote(value)}")
+        else:
+            pairs.extend([f"{quoted_key}={quote(element)}" for element in value])
+    return "&".join(pairs).encode()
+
+
+def encode_query_string(params: QueryParams | None, *, decode: bool = False) -> bytes:
+    """
+    Encodes query string parameters, the same as `urllib.parse.urlencode` with `doseq`,
+    in a single pass. If `decode` is set, the parameters are URL-decoded first, as the
+    load balancer passes them on as they were received, to prevent double encoding.
+
+    The query string built for the same parameters is remembered, so that it is not
+    built again for the same event or for a repeated request.
+    """
+    if not params:
+        return b""
+    items = tuple((key, value if isinstance(value, str) else tuple(value)) for key, value in params.items())
+    return build_query_string(items, decode)
+
+
+def get_query_string(event: LambdaEvent, *, decode: bool = False) -> bytes:
+    """
+    Returns the query string of an API Gateway, HTTP API or ALB event. The raw query
+    string is passed through when the event has one (HTTP API v2), otherwise it is
+    built from the multi-value parameters, or the single-value parameters if there are
+    none.
+    """
+    raw_query_string = event.get("rawQueryString")
+    if raw_query_string is not None:
+        return raw_query_string.encode()  # type: ignore[no-any-return]
+    params = event.get("multiValueQueryStringParameters") or event.get("queryStringParameters")
+    return encode_query_string(params, decode=decode)
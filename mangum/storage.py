@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import uuid
+from typing import Any
+
+from typing_extensions import Protocol
+
+from mangum.exceptions import ConfigurationError
+
+# The headers of a response that are stored with its body.
+STORED_HEADERS = ("content-type", "content-encoding", "content-disposition", "content-language", "cache-control")
+
+
+class ResponseStore(Protocol):
+    """A destination for response bodies too large to be returned by the function."""
+
+    def put(self, body: bytes, headers: dict[str, str]) -> str:
+        """Stores the body with the given headers and returns the URL it is served from."""
+        ...  # pragma: no cover
+
+
+class LocalDirectoryStore:
+    """
+    Stores response bodies as files in a local directory.
+
+    * **directory** - The directory the files are written to.
+    * **base_url** - The URL the directory is served from.
+    """
+
+    def __init__(self, directory: str, base_url: str) -> None:
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+
+    def put(self, body: bytes, headers: dict[str, str]) -> str:
+        name = uuid.uuid4().hex
+        with open(os.path.join(self.directory, name), "wb") as file:
+            file.write(body)
+
+        return f"{self.base_url}/{name}"
+
+
+class S3Store:
+    """
+    Stores response bodies as S3 objects and returns pre-signed URLs to download them.
+
+    * **bucket** - The name of the S3 bucket.
+    * **prefix** - A prefix for the object keys.
+    * **expires_in** - The number of seconds the pre-signed URLs are valid for.
+    * **client** - A boto3 S3 client. Defaults to a client created with the default
+    session, which requires the `boto3` package.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", expires_in: int = 3600, client: Any = None) -> None:
+        if client is None:  # pragma: no cover
+            try:
+                import boto3
+            except ImportError:
+                raise ConfigurationError("The `boto3` package is required to use the S3Store.")
+            client = boto3.client("s3")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.expires_in = expires_in
+        self.client = client
+
+    def put(self, body: bytes, headers: dict[str, str]) -> str:
+        key = f"{self.prefix}{uuid.uuid4().hex}"
+        params = {
+            "ContentType": headers.get("content-type"),
+            "ContentEncoding": headers.get("content-encoding"),
+            "ContentDisposition": headers.get("content-disposition"),
+            "ContentLanguage": headers.get("content-language"),
+            "CacheControl": headers.get("cache-control"),
+        }
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=body,
+            **{param: value for param, value in params.items() if value is not None},
+        )
+        url: str = self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.expires_in,
+        )
+        return url
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+
+from typing_extensions import Protocol
+
+from mangum.types import Headers, LambdaHandler
+
+PRELUDE_DELIMITER = b"\x00" * 8
+HTTP_INTEGRATION_CONTENT_TYPE = "application/vnd.awslambda.http-integration-response"
+
+
+class StreamWriter(Protocol):
+    """A destination for the bytes of a streamed Lambda response."""
+
+    def write(self, data: bytes) -> None: ...  # pragma: no cover
+
+    def close(self) -> None: ...  # pragma: no cover
+
+
+class HTTPIntegrationResponseStream:
+    """
+    Writes an ASGI response using the Lambda streaming HTTP integration format used by
+    Function URLs and `InvokeWithResponseStream`: a JSON metadata prelude containing the
+    status code, headers and cookies, followed by eight null bytes and the body chunks.
+
+    * **handler** - The handler for the event, used to format the response metadata.
+    * **writer** - The destination for the streamed bytes.
+    """
+
+    def __init__(self, handler: LambdaHandler, writer: StreamWriter) -> None:
+        self.handler = handler
+        self.writer = writer
+
+    def start(self, status: int, headers: Headers) -> None:
+        """Writes the metadata prelude for the `http.response.start` event."""
+        response = self.handler({"status": status, "headers": headers, "body": b""})
+        prelude = {key: response[key] for key in ("statusCode", "headers", "cookies") if key in response}
+        self.writer.write(json.dumps(prelude).encode() + PRELUDE_DELIMITER)
+
+    def write(self, body: bytes) -> None:
+        self.writer.write(body)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RuntimeAPIStreamWriter:
+    """
+    Streams a response for an invocation to the Lambda Runtime API using chunked
+    transfer encoding.
+
+    * **request_id** - The `Lambda-Runtime-Aws-Request-Id` of the invocation.
+    * **runtime_api** - The host and port of the Runtime API. Defaults to the
+    `AWS_LAMBDA_RUNTIME_API` environment variable.
+    """
+
+    def __init__(self, request_id: str, runtime_api: str | None = None) -> None:
+        self.connection = http.client.HTTPConnection(runtime_api or os.environ["AWS_LAMBDA_RUNTIME_API"])
+        self.connection.putrequest("POST", f"/2018-06-01/runtime/invocation/{request_id}/response")
+        self.connection.putheader("Lambda-Runtime-Function-Response-Mode", "streaming")
+        self.connection.putheader("Transfer-Encoding", "chunked")
+        self.connection.putheader("Content-Type", HTTP_INTEGRATION_CONTENT_TYPE)
+        self.connection.endheaders()
+
+    def write(self, data: bytes) -> None:
+        if data:
+            self.connection.send(b"%x\r\n%b\r\n" % (len(data), data))
+
+    def close(self) -> None:
+        self.connection.send(b"0\r\n\r\n")
+        self.connection.getresponse().read()
+        self.connection.close()
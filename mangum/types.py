@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import (
     Any,
     Awaitable,
     Callable,
     Dict,
+    Iterable,
     List,
+    Mapping,
     MutableMapping,
     Sequence,
     Union,
+    overload,
 )
 
 from typing_extensions import Literal, Protocol, TypeAlias, TypedDict
 
+from mangum.mime import TextMimeTypes
+
 LambdaEvent = Dict[str, Any]
 QueryParams: TypeAlias = MutableMapping[str, Union[str, Sequence[str]]]
 
@@ -104,6 +110,7 @@ class ASGI(Protocol):
 
 
 LifespanMode: TypeAlias = Literal["auto", "on", "off"]
+StartupMode: TypeAlias = Literal["invocation", "init"]
 
 
 class Response(TypedDict):
@@ -112,10 +119,96 @@ class Response(TypedDict):
     body: bytes
 
 
-class LambdaConfig(TypedDict):
+class BatchRequest(TypedDict):
+    """
+    A request made for a record of a batch event.
+
+    * **id** - The identifier of the record, reported if the request fails.
+    * **scope** - The connection scope of the request.
+    * **body** - The request body.
+    * **group** - The records of a group are run one after the other, in order, and those
+    after a failed record are not run. Records without a group are run concurrently.
+    """
+
+    id: str
+    scope: Scope
+    body: bytes
+    group: str | None
+
+
+class ResponseStream(Protocol):
+    def start(self, status: int, headers: Headers) -> None: ...  # pragma: no cover
+
+    def write(self, body: bytes) -> None: ...  # pragma: no cover
+
+    def close(self) -> None: ...  # pragma: no cover
+
+
+class LambdaConfig:
+    """
+    The configuration passed to the handlers, compiled once when the adapter is created.
+    It cannot be changed once compiled, and its settings are read by key as before.
+
+    * **api_gateway_base_path** - The base path, always with a leading slash.
+    * **text_mime_types** - The text MIME types, compiled into a classifier.
+    * **exclude_headers** - The lower-cased names of the response headers to exclude.
+    * **event_routes** - The paths the records of batch events are sent to, by event
+    source (such as `aws:sqs`).
+    """
+
+    __slots__ = ("api_gateway_base_path", "text_mime_types", "exclude_headers", "event_routes")
+
     api_gateway_base_path: str
-    text_mime_types: list[str]
-    exclude_headers: list[str]
+    text_mime_types: TextMimeTypes
+    exclude_headers: frozenset[str]
+    event_routes: Mapping[str, str]
+
+    def __init__(
+        self,
+        api_gateway_base_path: str = "/",
+        text_mime_types: Iterable[str] = (),
+        exclude_headers: Iterable[str] = (),
+        event_routes: Mapping[str, str] | None = None,
+    ) -> None:
+        api_gateway_base_path = api_gateway_base_path or "/"
+        if not api_gateway_base_path.startswith("/"):
+            api_gateway_base_path = f"/{api_gateway_base_path}"
+        if not isinstance(text_mime_types, TextMimeTypes):
+            text_mime_types = TextMimeTypes(text_mime_types)
+        object.__setattr__(self, "api_gateway_base_path", api_gateway_base_path)
+        object.__setattr__(self, "text_mime_types", text_mime_types)
+        object.__setattr__(self, "exclude_headers", frozenset(header.lower() for header in exclude_headers))
+        object.__setattr__(self, "event_routes", MappingProxyType(dict(event_routes or {})))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} cannot be changed once compiled")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} cannot be changed once compiled")
+
+    @overload
+    def __getitem__(self, key: Literal["api_gateway_base_path"]) -> str: ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, key: Literal["text_mime_types"]) -> TextMimeTypes: ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, key: Literal["exclude_headers"]) -> frozenset[str]: ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, key: Literal["event_routes"]) -> Mapping[str, str]: ...  # pragma: no cover
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __repr__(self) -> str:
+        settings = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({settings})"
 
 
 class LambdaHandler(Protocol):
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Union
+
+from typing_extensions import Protocol
+
+from mangum.exceptions import ConfigurationError
+
+logger = logging.getLogger("mangum.websocket")
+
+# The metadata of a WebSocket connection, as stored when it is accepted. It is made of
+# JSON values so that it can be kept in any store.
+Connection = Dict[str, Any]
+# A message sent to a connection, as text or binary data.
+OutgoingMessage = Union[str, bytes]
+
+
+class ConnectionStore(Protocol):
+    """
+    Keeps the metadata of the open WebSocket connections between the invocations for
+    their `$connect`, `$default` and `$disconnect` events.
+
+    A store shared by all the execution environments of the function (such as a
+    DynamoDB table) is required in production, as the events of a connection are not
+    all handled by the same execution environment.
+    """
+
+    def put(self, connection_id: str, connection: Connection) -> None:
+        """Stores the metadata of a connection once it is accepted."""
+        ...  # pragma: no cover
+
+    def get(self, connection_id: str) -> Connection | None:
+        """Returns the metadata of a connection, if it is stored."""
+        ...  # pragma: no cover
+
+    def delete(self, connection_id: str) -> None:
+        """Removes the metadata of a connection once it is closed."""
+        ...  # pragma: no cover
+
+
+class MemoryConnectionStore:
+    """Stores the connections in memory, for local testing and single environments."""
+
+    def __init__(self) -> None:
+        self.connections: dict[str, Connection] = {}
+
+    def put(self, connection_id: str, connection: Connection) -> None:
+        self.connections[connection_id] = connection
+
+    def get(self, connection_id: str) -> Connection | None:
+        return self.connections.get(connection_id)
+
+    def delete(self, connection_id: str) -> None:
+        self.connections.pop(connection_id, None)
+
+
+class SQLiteConnectionStore:
+    """
+    Stores the connections as JSON in an SQLite database, for local testing.
+
+    * **path** - The path of the database file, created if it does not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS connections (connection_id TEXT PRIMARY KEY, connection TEXT)")
+
+    def put(self, connection_id: str, connection: Connection) -> None:
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO connections (connection_id, connection) VALUES (?, ?)",
+                (connection_id, json.dumps(connection)),
+            )
+
+    def get(self, connection_id: str) -> Connection | None:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT connection FROM connections WHERE connection_id = ?", (connection_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        connection: Connection = json.loads(row[0])
+        return connection
+
+    def delete(self, connection_id: str) -> None:
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM connections WHERE connection_id = ?", (connection_id,))
+
+
+class ManagementAPI:
+    """
+    Sends messages to WebSocket connections and closes them with the API Gateway
+    management API.
+
+    The messages sent during an invocation are posted in order once the application has
+    returned, with a client kept for the life of the execution environment.
+
+    * **endpoint_url** - The URL of the management API. Defaults to the URL of the
+    stage the event was received on (`https://{domainName}/{stage}`), it may be set to
+    the URL of a local stand-in server.
+    * **client** - An `apigatewaymanagementapi` boto3 client. Defaults to a client
+    created with the default session for each endpoint, which requires the `boto3`
+    package.
+    """
+
+    def __init__(self, endpoint_url: str | None = None, client: Any = None) -> None:
+        self.endpoint_url = endpoint_url
+        self.client = client
+        self.clients: dict[str, Any] = {}
+
+    def get_client(self, endpoint_url: str) -> Any:
+        if self.client is not None:
+            return self.client
+
+        endpoint_url = self.endpoint_url or endpoint_url
+        client = self.clients.get(endpoint_url)
+        if client is None:  # pragma: no cover
+            try:
+                import boto3
+            except ImportError:
+                raise ConfigurationError("The `boto3` package is required to use the ManagementAPI.")
+            client = boto3.client("apigatewaymanagementapi", endpoint_url=endpoint_url)
+            self.clients[endpoint_url] = client
+        return client
+
+    def send(self, endpoint_url: str, connection_id: str, messages: list[OutgoingMessage], *, close: bool) -> None:
+        """Posts the messages to the connection in order, then deletes the connection if
+        `close` is set.
+        """
+        client = self.get_client(endpoint_url)
+        for message in messages:
+            try:
+                client.post_to_connection(
+                    ConnectionId=connection_id,
+                    Data=message.encode() if isinstance(message, str) else message,
+                )
+            except Exception:
+                # The connection is most likely gone, the following messages would fail too.
+                logger.warning("Failed to send a message to the WebSocket connection %s.", connection_id, exc_info=True)
+                break
+
+        if close:
+            try:
+                client.delete_connection(ConnectionId=connection_id)
+            except Exception:
+                logger.warning("Failed to close the WebSocket connection %s.", connection_id, exc_info=True)
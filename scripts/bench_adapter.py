@@ -0,0 +1,29 @@
+"""
+Measures the overhead of the adapter, with a trivial application behind an HTTP API v2
+event and the lifespan off.
+
+    uv run scripts/bench_adapter.py
+"""
+
+from __future__ import annotations
+
+from benchmark import best_of, get_http_v2_event, get_request_headers
+
+from mangum import Mangum
+
+
+async def app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"text/plain"]]})
+    await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+
+def main() -> None:
+    handler = Mangum(app, lifespan="off")
+    event = get_http_v2_event(get_request_headers(10))
+    elapsed = best_of(lambda: handler(event, {}), number=20000, repeat=5)
+    print(f"{elapsed:.1f} us/request ({1e6 / elapsed:,.0f} requests/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measures the header conversion of the HTTP handlers, with the scope of an event and the
+response built for 20, 30 and 40 request headers (and as many response headers, less a
+quarter).
+
+    uv run scripts/bench_headers.py
+"""
+
+from __future__ import annotations
+
+from benchmark import (
+    best_of,
+    get_api_gateway_event,
+    get_http_v2_event,
+    get_lambda_at_edge_event,
+    get_request_headers,
+    get_response,
+)
+
+from mangum.adapter import DEFAULT_TEXT_MIME_TYPES
+from mangum.handlers import APIGateway, HTTPGateway, LambdaAtEdge
+from mangum.types import LambdaConfig
+
+
+def main() -> None:
+    config = LambdaConfig(text_mime_types=DEFAULT_TEXT_MIME_TYPES)
+    for header_count in (20, 30, 40):
+        headers = get_request_headers(header_count)
+        response = get_response(header_count * 3 // 4)
+        print(f"{header_count} request headers, {len(response['headers'])} response headers")
+        for name, handler_cls, event in [
+            ("HTTPGateway", HTTPGateway, get_http_v2_event(headers)),
+            ("APIGateway", APIGateway, get_api_gateway_event(headers)),
+            ("LambdaAtEdge", LambdaAtEdge, get_lambda_at_edge_event(headers)),
+        ]:
+
+            def run(handler_cls=handler_cls, event=event) -> None:
+                handler = handler_cls(event, {}, config)
+                handler.scope
+                handler(response)
+
+            elapsed = best_of(run, number=5000, repeat=9)
+            print(f"  {name:<14} {elapsed:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
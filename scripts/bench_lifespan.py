@@ -0,0 +1,45 @@
+"""
+Measures the lifespan overhead of an invocation, with a lifespan cycle per invocation
+and with a persistent lifespan. The startup of the application awaits 1 ms.
+
+    uv run scripts/bench_lifespan.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from benchmark import best_of, get_http_v2_event, get_request_headers
+
+from mangum import Mangum
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.sleep(0.001)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"text/plain"]]})
+    await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+
+def main() -> None:
+    event = get_http_v2_event(get_request_headers(10))
+    for name, handler in [
+        ("per-invocation lifespan", Mangum(app, lifespan="on")),
+        ("persistent lifespan", Mangum(app, lifespan="on", persistent_lifespan=True)),
+    ]:
+        elapsed = best_of(lambda: handler(event, {}), number=500, repeat=5)
+        print(f"{name:<24} {elapsed:8.1f} us/request")
+        handler.shutdown()
+
+
+if __name__ == "__main__":
+    main()
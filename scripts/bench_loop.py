@@ -0,0 +1,46 @@
+"""
+Measures the event loop overhead of running a no-op coroutine, as the cycles did before
+the adapter owned its loop, with the loop owned by the adapter, and with `asyncio.run`.
+
+    uv run scripts/bench_loop.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from benchmark import best_of
+
+
+async def noop() -> None:
+    pass
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    def get_event_loop() -> None:
+        current_loop = asyncio.get_event_loop()
+        task = current_loop.create_task(noop())
+        current_loop.run_until_complete(task)
+
+    def owned_loop() -> None:
+        loop.run_until_complete(noop())
+
+    def asyncio_run() -> None:
+        asyncio.run(noop())
+
+    for name, func in [
+        ("get_event_loop + create_task", get_event_loop),
+        ("owned loop", owned_loop),
+        ("asyncio.run", asyncio_run),
+    ]:
+        elapsed = best_of(func, number=20000, repeat=5)
+        print(f"{name:<30} {elapsed:8.1f} us/run")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
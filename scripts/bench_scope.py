@@ -0,0 +1,48 @@
+"""
+Measures the time taken by each HTTP handler to build the scope and body of an event
+and to return the response.
+
+    uv run scripts/bench_scope.py
+"""
+
+from __future__ import annotations
+
+from benchmark import (
+    best_of,
+    get_alb_event,
+    get_api_gateway_event,
+    get_http_v1_event,
+    get_http_v2_event,
+    get_lambda_at_edge_event,
+    get_request_headers,
+    get_response,
+)
+
+from mangum.adapter import DEFAULT_TEXT_MIME_TYPES
+from mangum.handlers import ALB, APIGateway, HTTPGateway, LambdaAtEdge
+from mangum.types import LambdaConfig
+
+
+def main() -> None:
+    config = LambdaConfig(text_mime_types=DEFAULT_TEXT_MIME_TYPES)
+    response = get_response(5)
+    for name, handler_cls, event in [
+        ("ALB (20 headers)", ALB, get_alb_event(get_request_headers(20))),
+        ("APIGateway", APIGateway, get_api_gateway_event(get_request_headers(10))),
+        ("HTTPGateway v1", HTTPGateway, get_http_v1_event(get_request_headers(10))),
+        ("HTTPGateway v2", HTTPGateway, get_http_v2_event(get_request_headers(10))),
+        ("LambdaAtEdge", LambdaAtEdge, get_lambda_at_edge_event(get_request_headers(10))),
+    ]:
+
+        def run(handler_cls=handler_cls, event=event) -> None:
+            handler = handler_cls(event, {}, config)
+            handler.scope
+            handler.body
+            handler(response)
+
+        elapsed = best_of(run, number=20000, repeat=3)
+        print(f"{name:<18} {elapsed:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+The helpers shared by the `scripts/bench_*.py` benchmarks. The benchmarks are run from
+the project environment, so that the local `mangum` is imported:
+
+    uv run scripts/bench_adapter.py
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+
+def best_of(func: Callable[[], Any], number: int, repeat: int) -> float:
+    """Returns the best time of `repeat` runs of `number` calls, in microseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) / number * 1e6
+
+
+def get_request_headers(count: int) -> dict[str, str]:
+    """Returns `count` request headers, starting with the common ones of a browser."""
+    headers = {
+        "Host": "abc.execute-api.us-east-1.amazonaws.com",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept-Language": "en-US,en;q=0.8",
+        "Cache-Control": "max-age=0",
+        "Cookie": "session=abc; theme=dark",
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+        "X-Forwarded-For": "192.168.100.1",
+        "X-Forwarded-Port": "443",
+        "X-Forwarded-Proto": "https",
+    }
+    for index in range(len(headers), count):
+        headers[f"X-Custom-Header-{index}"] = f"value-{index}"
+
+    return dict(list(headers.items())[:count])
+
+
+def get_http_v2_event(headers: dict[str, str]) -> dict[str, Any]:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/items/1",
+        "rawQueryString": "q=1",
+        "headers": {key.lower(): value for key, value in headers.items()},
+        "requestContext": {
+            "http": {"method": "GET", "path": "/items/1", "protocol": "HTTP/1.1", "sourceIp": "192.168.100.1"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def get_http_v1_event(headers: dict[str, str]) -> dict[str, Any]:
+    return {
+        "version": "1.0",
+        "resource": "/items/{id}",
+        "path": "/items/1",
+        "httpMethod": "GET",
+        "headers": headers,
+        "multiValueHeaders": {key: [value] for key, value in headers.items()},
+        "queryStringParameters": {"q": "1"},
+        "multiValueQueryStringParameters": {"q": ["1"]},
+        "requestContext": {"identity": {"sourceIp": "192.168.100.1"}, "stage": "$default"},
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def get_api_gateway_event(headers: dict[str, str]) -> dict[str, Any]:
+    event = get_http_v1_event(headers)
+    del event["version"]
+    return event
+
+
+def get_alb_event(headers: dict[str, str]) -> dict[str, Any]:
+    return {
+        "requestContext": {
+            "elb": {"targetGroupArn": "arn:aws:elasticloadbalancing:us-east-1:123456789012:targetgroup"}
+        },
+        "path": "/items/1",
+        "httpMethod": "GET",
+        "headers": headers,
+        "queryStringParameters": {"q": "1"},
+        "body": "",
+        "isBase64Encoded": False,
+    }
+
+
+def get_lambda_at_edge_event(headers: dict[str, str]) -> dict[str, Any]:
+    request = {
+        "clientIp": "192.168.100.1",
+        "headers": {key.lower(): [{"key": key, "value": value}] for key, value in headers.items()},
+        "method": "GET",
+        "querystring": "q=1",
+        "uri": "/items/1",
+    }
+    return {"Records": [{"cf": {"config": {"distributionDomainName": "abc.cloudfront.net"}, "request": request}}]}
+
+
+def get_response(header_count: int) -> dict[str, Any]:
+    """Returns a response with `header_count` headers, including two cookies."""
+    headers = [
+        [b"content-type", b"text/plain; charset=utf-8"],
+        [b"set-cookie", b"a=1; Path=/"],
+        [b"set-cookie", b"b=2; Path=/"],
+    ]
+    for index in range(len(headers), header_count):
+        headers.append([f"x-custom-header-{index}".encode(), f"value-{index}".encode()])
+
+    return {"status": 200, "headers": headers[:header_count], "body": b"Hello, world!"}
@@ -3,6 +3,47 @@ import os
 import pytest
 
 
+class MockLambdaContext:
+    """A Lambda context with the remaining time of the invocation and the memory of the
+    function.
+    """
+
+    def __init__(self, remaining_time_in_millis: int = 3000, memory_limit_in_mb: str = "128") -> None:
+        self.remaining_time_in_millis = remaining_time_in_millis
+        self.memory_limit_in_mb = memory_limit_in_mb
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_time_in_millis
+
+
+@pytest.fixture
+def mock_lambda_context():
+    return MockLambdaContext
+
+
+@pytest.fixture
+def make_app():
+    """Returns a factory of applications sending a response with the given status,
+    headers and body, along with the list of the scopes they are called with. The body
+    defaults to the path, the query string and the number of calls.
+    """
+
+    def make_app(headers=(), status=200, body=None):
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope)
+            response_body = body
+            if response_body is None:
+                response_body = f"{scope['path']}?{scope['query_string'].decode()} {len(calls)}".encode()
+            await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+            await send({"type": "http.response.body", "body": response_body})
+
+        return app, calls
+
+    return make_app
+
+
 @pytest.fixture
 def mock_aws_api_gateway_event(request):
     method = request.param[0]
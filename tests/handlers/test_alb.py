@@ -9,7 +9,7 @@ from __future__ import annotations
 import pytest
 
 from mangum import Mangum
-from mangum.handlers.alb import ALB
+from mangum.handlers.alb import ALB, get_casings
 
 
 def get_mock_aws_alb_event(
@@ -397,3 +397,45 @@ def test_aws_alb_exclude_headers(multi_value_headers_enabled) -> None:
             "content-type": "text/plain; charset=utf-8",
         }
     assert response == expected_response
+
+
+@pytest.mark.parametrize("multi_value_headers_enabled", (True, False))
+def test_aws_alb_scope_cached(multi_value_headers_enabled) -> None:
+    event = get_mock_aws_alb_event("POST", "/", None, None, "SGVsbG8=", True, multi_value_headers_enabled)
+    handler = ALB(event, {}, {"api_gateway_base_path": "/"})
+
+    assert handler.scope is handler.scope
+    assert handler.body is handler.body
+    assert handler.body == b"Hello"
+    assert handler.multi_value_headers_enabled is multi_value_headers_enabled
+
+
+def test_aws_alb_iter_body() -> None:
+    event = get_mock_aws_alb_event("POST", "/", None, None, "SGVsbG8=", True, False)
+    handler = ALB(event, {}, {"api_gateway_base_path": "/"})
+
+    assert list(handler.iter_body(3)) == [b"Hel", b"lo"]
+
+
+def test_aws_alb_get_casings() -> None:
+    assert get_casings("set-cookie", 5) == ("set-cookie", "Set-cookie", "sEt-cookie", "SEt-cookie", "seT-cookie")
+    assert get_casings("x-1", 4) == ("x-1", "X-1")
+
+
+def test_aws_alb_too_few_casings(caplog) -> None:
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [[b"x-1", b"a"], [b"x-1", b"b"], [b"x-1", b"c"]],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    handler = Mangum(app, lifespan="off")
+    event = get_mock_aws_alb_event("GET", "/", {}, None, None, False, False)
+    response = handler(event, {})
+
+    assert response["headers"] == {"x-1": "a", "X-1": "b, c"}
+    assert "The x-1 header has too few casings to return 3 values" in caplog.text
@@ -413,3 +413,12 @@ def test_aws_api_gateway_exclude_headers():
         "multiValueHeaders": {},
         "body": "Hello world",
     }
+
+
+def test_aws_api_gateway_scope_cached():
+    event = get_mock_aws_api_gateway_event("POST", "/test", {}, "SGVsbG8=", True)
+    handler = APIGateway(event, {}, {"api_gateway_base_path": "/"})
+
+    assert handler.scope is handler.scope
+    assert handler.body is handler.body
+    assert handler.body == b"Hello"
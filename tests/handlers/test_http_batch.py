@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import time
+
+import pytest
+
+from mangum import Mangum
+from mangum.handlers import HTTPBatch
+from mangum.types import LambdaConfig
+
+
+async def app(scope, receive, send):
+    assert scope["type"] == "http"
+    message = await receive()
+    if scope["path"] == "/sleep":
+        await asyncio.sleep(0.05)
+    elif scope["path"] == "/hang":
+        await asyncio.sleep(10)
+    elif scope["path"] == "/error":
+        raise RuntimeError()
+    elif scope["path"] == "/empty":
+        return
+    elif scope["path"] == "/binary":
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"image/png"]]})
+        await send({"type": "http.response.body", "body": b"\x89PNG"})
+        return
+
+    body = f"{scope['method']} {scope['path']}?{scope['query_string'].decode()} ".encode() + message["body"]
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [[b"content-type", b"text/plain"], [b"set-cookie", b"a=1"], [b"set-cookie", b"b=2"]],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def test_http_batch_infer() -> None:
+    config = LambdaConfig()
+    assert HTTPBatch.infer({"requests": []}, {}, config)
+    assert not HTTPBatch.infer({"requests": "a"}, {}, config)
+    assert not HTTPBatch.infer({"Records": []}, {}, config)
+
+
+def test_http_batch_requests() -> None:
+    event = {
+        "requests": [
+            {
+                "id": "a",
+                "method": "post",
+                "path": "/api/items",
+                "headers": {"Host": "example.com", "Content-Type": "application/json"},
+                "queryStringParameters": {"q": "a b"},
+                "body": base64.b64encode(b'{"a": 1}').decode(),
+                "isBase64Encoded": True,
+            },
+            {"path": "/items/1"},
+        ]
+    }
+    handler = HTTPBatch(event, {}, LambdaConfig(api_gateway_base_path="api"))
+    first, second = handler.requests
+    assert first == {
+        "id": "a",
+        "scope": {
+            "type": "http",
+            "method": "POST",
+            "http_version": "1.1",
+            "headers": [[b"host", b"example.com"], [b"content-type", b"application/json"]],
+            "path": "/items",
+            "raw_path": None,
+            "root_path": "",
+            "scheme": "https",
+            "query_string": b"q=a+b",
+            "server": ("example.com", 80),
+            "client": None,
+            "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "aws.event": event,
+            "aws.context": {},
+            "aws.record": event["requests"][0],
+        },
+        "body": b'{"a": 1}',
+        "group": None,
+    }
+    assert second["id"] == "1"
+    assert second["scope"]["method"] == "GET"
+    assert second["body"] == b""
+
+
+def test_http_batch_responses() -> None:
+    handler = Mangum(app, lifespan="off")
+    event = {
+        "requests": [
+            {"id": "a", "method": "POST", "path": "/items", "body": "hello"},
+            {"id": "b", "path": "/error"},
+            {"id": "c", "path": "/binary"},
+            {"id": "d", "path": "/items/1", "multiValueQueryStringParameters": {"q": ["1", "2"]}},
+        ]
+    }
+    response = handler(event, {})
+    assert response == {
+        "responses": [
+            {
+                "id": "a",
+                "statusCode": 200,
+                "headers": {"content-type": "text/plain"},
+                "multiValueHeaders": {"set-cookie": ["a=1", "b=2"]},
+                "body": "POST /items? hello",
+                "isBase64Encoded": False,
+            },
+            {
+                "id": "b",
+                "statusCode": 500,
+                "headers": {"content-type": "text/plain; charset=utf-8"},
+                "multiValueHeaders": {},
+                "body": "Internal Server Error",
+                "isBase64Encoded": False,
+            },
+            {
+                "id": "c",
+                "statusCode": 200,
+                "headers": {"content-type": "image/png"},
+                "multiValueHeaders": {},
+                "body": base64.b64encode(b"\x89PNG").decode(),
+                "isBase64Encoded": True,
+            },
+            {
+                "id": "d",
+                "statusCode": 200,
+                "headers": {"content-type": "text/plain"},
+                "multiValueHeaders": {"set-cookie": ["a=1", "b=2"]},
+                "body": "GET /items/1?q=1&q=2 ",
+                "isBase64Encoded": False,
+            },
+        ]
+    }
+
+
+def test_http_batch_invalid_requests() -> None:
+    handler = Mangum(app, lifespan="off")
+    event = {
+        "requests": [
+            {"id": "a", "method": "GET"},
+            "/items/1",
+            {"id": "c", "path": "/items/1", "headers": ["host"]},
+            {"id": "d", "path": "/items/2"},
+            {"id": "e", "path": "/empty"},
+        ]
+    }
+    response = handler(event, {})
+    assert [(item["id"], item["statusCode"]) for item in response["responses"]] == [
+        ("a", 400),
+        ("1", 400),
+        ("c", 400),
+        ("d", 200),
+        ("e", 502),
+    ]
+    assert response["responses"][0]["body"] == "Invalid request descriptor."
+    assert response["responses"][3]["body"] == "GET /items/2? "
+    # The application returned without a response.
+    assert response["responses"][4]["body"] == "Bad Gateway"
+
+
+def test_http_batch_concurrency() -> None:
+    handler = Mangum(app, lifespan="off", batch_concurrency=10)
+    event = {"requests": [{"path": "/sleep"} for _ in range(10)]}
+    start = time.perf_counter()
+    response = handler(event, {})
+    assert time.perf_counter() - start < 0.25
+    assert [item["statusCode"] for item in response["responses"]] == [200] * 10
+
+
+def test_http_batch_deadline(caplog, mock_lambda_context) -> None:
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0)
+    response = handler(
+        {"requests": [{"id": "a", "path": "/items"}, {"id": "b", "path": "/hang"}]}, mock_lambda_context(100)
+    )
+    assert [(item["id"], item["statusCode"]) for item in response["responses"]] == [("a", 200), ("b", 504)]
+    assert response["responses"][1]["body"] == ""
+    assert "1 of 2 batch requests not run, the invocation deadline was reached." in caplog.text
+
+
+def test_http_batch_stream() -> None:
+    handler = Mangum(app, lifespan="off")
+    with pytest.raises(RuntimeError, match="The responses to batch events cannot be streamed."):
+        handler.stream({"requests": []}, {}, None)
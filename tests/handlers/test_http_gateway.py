@@ -657,3 +657,63 @@ def test_aws_http_gateway_response_v2_extra_mime_types():
         "headers": {"content-type": content_type.decode()},
         "body": utf_res_body,
     }
+
+
+def test_aws_http_gateway_exclude_headers_v2():
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    [b"content-type", b"text/plain; charset=utf-8"],
+                    [b"x-custom-header", b"test"],
+                    [b"set-cookie", b"cookie1=cookie1"],
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"Hello world"})
+
+    event = get_mock_aws_http_gateway_event_v2("GET", "/test", {}, None, False)
+
+    handler = Mangum(app, lifespan="off", exclude_headers=["X-CUSTOM-HEADER", "set-cookie"])
+    response = handler(event, {})
+    assert response == {
+        "statusCode": 200,
+        "isBase64Encoded": False,
+        "headers": {"content-type": "text/plain; charset=utf-8"},
+        "body": "Hello world",
+    }
+
+    # The body is still encoded according to an excluded content type.
+    handler = Mangum(app, lifespan="off", exclude_headers=["content-type"])
+    response = handler(event, {})
+    assert response == {
+        "statusCode": 200,
+        "isBase64Encoded": False,
+        "headers": {"x-custom-header": "test"},
+        "cookies": ["cookie1=cookie1"],
+        "body": "Hello world",
+    }
+
+
+@pytest.mark.parametrize(
+    "get_mock_event,is_v2",
+    [(get_mock_aws_http_gateway_event_v1, False), (get_mock_aws_http_gateway_event_v2, True)],
+)
+def test_aws_http_gateway_scope_cached(get_mock_event, is_v2):
+    event = get_mock_event("POST", "/test", {}, "SGVsbG8=", True)
+    handler = HTTPGateway(event, {}, {"api_gateway_base_path": "/"})
+
+    assert handler.scope is handler.scope
+    assert handler.body is handler.body
+    assert handler.body == b"Hello"
+    assert handler.is_v2 is is_v2
+
+
+@pytest.mark.parametrize("get_mock_event", [get_mock_aws_http_gateway_event_v1, get_mock_aws_http_gateway_event_v2])
+def test_aws_http_gateway_iter_body(get_mock_event):
+    event = get_mock_event("POST", "/test", {}, "SGVsbG8=", True)
+    handler = HTTPGateway(event, {}, {"api_gateway_base_path": "/"})
+
+    assert list(handler.iter_body(3)) == [b"Hel", b"lo"]
@@ -348,3 +348,19 @@ def test_aws_lambda_at_edge_exclude_():
         "headers": {"content-type": [{"key": "content-type", "value": b"text/plain; charset=utf-8".decode()}]},
         "body": "Hello world",
     }
+
+
+def test_aws_lambda_at_edge_scope_cached():
+    event = mock_lambda_at_edge_event("POST", "/test", {}, "SGVsbG8=", True)
+    handler = LambdaAtEdge(event, {}, {"api_gateway_base_path": "/"})
+
+    assert handler.scope is handler.scope
+    assert handler.body is handler.body
+    assert handler.body == b"Hello"
+
+
+def test_aws_lambda_at_edge_iter_body():
+    event = mock_lambda_at_edge_event("POST", "/test", {}, "SGVsbG8=", True)
+    handler = LambdaAtEdge(event, {}, {"api_gateway_base_path": "/"})
+
+    assert list(handler.iter_body(3)) == [b"Hel", b"lo"]
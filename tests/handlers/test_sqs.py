@@ -0,0 +1,218 @@
+import asyncio
+
+import pytest
+
+from mangum import Mangum
+from mangum.handlers import SQS, BatchHandler
+from mangum.types import LambdaConfig
+
+
+def get_mock_sqs_record(message_id, body, group_id=None, content_type=None):
+    record = {
+        "messageId": message_id,
+        "receiptHandle": "MessageReceiptHandle",
+        "body": body,
+        "attributes": {
+            "ApproximateReceiveCount": "1",
+            "SentTimestamp": "1523232000000",
+            "SenderId": "123456789012",
+            "ApproximateFirstReceiveTimestamp": "1523232000001",
+        },
+        "messageAttributes": {},
+        "md5OfBody": "7b270e59b47ff90a553787216d55d91d",
+        "eventSource": "aws:sqs",
+        "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:MyQueue",
+        "awsRegion": "us-east-1",
+    }
+    if group_id is not None:
+        record["attributes"]["MessageGroupId"] = group_id
+    if content_type is not None:
+        record["messageAttributes"]["Content-Type"] = {"stringValue": content_type, "dataType": "String"}
+    return record
+
+
+def get_mock_sqs_event(*records):
+    return {"Records": list(records)}
+
+
+async def echo_app(scope, receive, send):
+    assert scope["type"] == "http"
+    message = await receive()
+    status = 500 if message["body"].startswith(b"fail") else 200
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+
+def test_sqs_infer() -> None:
+    config = LambdaConfig()
+    assert SQS.infer(get_mock_sqs_event(get_mock_sqs_record("1", "a")), {}, config)
+    assert not SQS.infer({"Records": [{"cf": {}}]}, {}, config)
+    assert not SQS.infer({"Records": []}, {}, config)
+    assert not SQS.infer({}, {}, config)
+
+
+def test_sqs_requests() -> None:
+    record = get_mock_sqs_record("1", '{"a": 1}', group_id="group", content_type="application/json")
+    event = get_mock_sqs_event(record)
+    handler = SQS(event, {}, LambdaConfig())
+
+    assert handler.requests is handler.requests
+    assert handler.requests == [
+        {
+            "id": "1",
+            "scope": {
+                "type": "http",
+                "method": "POST",
+                "http_version": "1.1",
+                "headers": [[b"content-type", b"application/json"]],
+                "path": "/sqs",
+                "raw_path": None,
+                "root_path": "",
+                "scheme": "https",
+                "query_string": b"",
+                "server": ("mangum", 80),
+                "client": None,
+                "asgi": {"version": "3.0", "spec_version": "2.0"},
+                "aws.event": event,
+                "aws.context": {},
+                "aws.record": record,
+            },
+            "body": b'{"a": 1}',
+            "group": "group",
+        }
+    ]
+
+
+def test_sqs_event_routes() -> None:
+    async def app(scope, receive, send):
+        status = 200 if scope["path"] == "/jobs" else 404
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    event = get_mock_sqs_event(get_mock_sqs_record("1", "a"))
+    assert Mangum(app, lifespan="off")(event, {}) == {"batchItemFailures": [{"itemIdentifier": "1"}]}
+    handler = Mangum(app, lifespan="off", event_routes={"aws:sqs": "/jobs"})
+    assert handler(event, {}) == {"batchItemFailures": []}
+
+
+def test_sqs_batch_item_failures() -> None:
+    async def app(scope, receive, send):
+        message = await receive()
+        if message["body"] == b"error":
+            raise RuntimeError()
+        if message["body"] == b"no response":
+            return
+        await echo_app(scope, lambda: asyncio.sleep(0, message), send)
+
+    event = get_mock_sqs_event(
+        get_mock_sqs_record("1", "ok"),
+        get_mock_sqs_record("2", "fail"),
+        get_mock_sqs_record("3", "error"),
+        get_mock_sqs_record("4", "no response"),
+        get_mock_sqs_record("5", "ok"),
+    )
+    handler = Mangum(app, lifespan="off")
+    assert handler(event, {}) == {
+        "batchItemFailures": [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}, {"itemIdentifier": "4"}]
+    }
+
+
+def test_sqs_concurrency() -> None:
+    running = 0
+    max_running = 0
+
+    async def app(scope, receive, send):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        await echo_app(scope, receive, send)
+
+    event = get_mock_sqs_event(*(get_mock_sqs_record(str(index), "ok") for index in range(10)))
+    handler = Mangum(app, lifespan="off", batch_concurrency=3)
+    assert handler(event, {}) == {"batchItemFailures": []}
+    assert max_running == 3
+
+
+def test_sqs_message_groups() -> None:
+    calls = []
+
+    async def app(scope, receive, send):
+        message = await receive()
+        calls.append(message["body"])
+        await asyncio.sleep(0)
+        await echo_app(scope, lambda: asyncio.sleep(0, message), send)
+
+    event = get_mock_sqs_event(
+        get_mock_sqs_record("1", "a1", group_id="a"),
+        get_mock_sqs_record("2", "b1", group_id="b"),
+        get_mock_sqs_record("3", "fail a2", group_id="a"),
+        get_mock_sqs_record("4", "b2", group_id="b"),
+        get_mock_sqs_record("5", "a3", group_id="a"),
+    )
+    handler = Mangum(app, lifespan="off")
+
+    # The messages of a group after a failed message are not run, so they are retried
+    # in order.
+    assert handler(event, {}) == {"batchItemFailures": [{"itemIdentifier": "3"}, {"itemIdentifier": "5"}]}
+    assert calls == [b"a1", b"b1", b"fail a2", b"b2"]
+
+
+def test_sqs_deadline(caplog, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        message = await receive()
+        if message["body"] == b"slow":
+            await asyncio.sleep(10)
+        await echo_app(scope, lambda: asyncio.sleep(0, message), send)
+
+    event = get_mock_sqs_event(
+        get_mock_sqs_record("1", "ok"),
+        get_mock_sqs_record("2", "slow"),
+        get_mock_sqs_record("3", "ok"),
+    )
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0, batch_concurrency=2)
+    assert handler(event, mock_lambda_context(100)) == {"batchItemFailures": [{"itemIdentifier": "2"}]}
+    assert "1 of 3 batch requests not run, the invocation deadline was reached." in caplog.text
+
+    # The requests waiting to run once the deadline is reached are not run.
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0, batch_concurrency=1)
+    assert handler(event, mock_lambda_context(100)) == {
+        "batchItemFailures": [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}]
+    }
+
+
+def test_sqs_lifespan_state() -> None:
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    scope["state"].update({"status": 202})
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        await send({"type": "http.response.start", "status": scope["state"]["status"], "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    handler = Mangum(app, lifespan="on")
+    event = get_mock_sqs_event(get_mock_sqs_record("1", "ok"), get_mock_sqs_record("2", "ok"))
+    assert handler(event, {}) == {"batchItemFailures": []}
+
+
+def test_sqs_pinned_handler() -> None:
+    handler = Mangum(echo_app, lifespan="off", handler=SQS)
+    assert isinstance(handler.infer(get_mock_sqs_event(get_mock_sqs_record("1", "ok")), {}), SQS)
+
+
+def test_sqs_stream() -> None:
+    handler = Mangum(echo_app, lifespan="off")
+    with pytest.raises(RuntimeError, match="The responses to aws:sqs events cannot be streamed."):
+        handler.stream(get_mock_sqs_event(get_mock_sqs_record("1", "ok")), {}, None)
+
+
+def test_batch_handler_abstract() -> None:
+    with pytest.raises(TypeError):
+        BatchHandler(get_mock_sqs_event(), {}, LambdaConfig())
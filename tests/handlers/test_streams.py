@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from mangum import Mangum
+from mangum.handlers import DynamoDBStreams, Kinesis
+from mangum.handlers.streams import deserialize_attribute_value
+from mangum.types import LambdaConfig
+
+
+def get_mock_kinesis_record(sequence_number, partition_key, data):
+    return {
+        "kinesis": {
+            "kinesisSchemaVersion": "1.0",
+            "partitionKey": partition_key,
+            "sequenceNumber": sequence_number,
+            "data": base64.b64encode(data).decode(),
+            "approximateArrivalTimestamp": 1545084650.987,
+        },
+        "eventSource": "aws:kinesis",
+        "eventVersion": "1.0",
+        "eventID": f"shardId-000000000006:{sequence_number}",
+        "eventName": "aws:kinesis:record",
+        "invokeIdentityArn": "arn:aws:iam::123456789012:role/lambda-role",
+        "awsRegion": "us-east-2",
+        "eventSourceARN": "arn:aws:kinesis:us-east-2:123456789012:stream/lambda-stream",
+    }
+
+
+def get_mock_dynamodb_record(sequence_number, key, event_name="INSERT", new_image=None):
+    dynamodb = {
+        "Keys": {"Id": {"N": str(key)}},
+        "SequenceNumber": sequence_number,
+        "SizeBytes": 26,
+        "StreamViewType": "NEW_AND_OLD_IMAGES",
+    }
+    if new_image is not None:
+        dynamodb["NewImage"] = new_image
+    return {
+        "eventID": "1",
+        "eventVersion": "1.0",
+        "dynamodb": dynamodb,
+        "awsRegion": "us-east-1",
+        "eventName": event_name,
+        "eventSourceARN": "arn:aws:dynamodb:us-east-1:123456789012:table/ExampleTable/stream/2015-06-27T00:48:05.899",
+        "eventSource": "aws:dynamodb",
+    }
+
+
+def test_kinesis_requests() -> None:
+    record = get_mock_kinesis_record("1", "key", b"\x00Hello")
+    event = {"Records": [record]}
+    config = LambdaConfig()
+    assert Kinesis.infer(event, {}, config)
+    assert not DynamoDBStreams.infer(event, {}, config)
+
+    (request,) = Kinesis(event, {}, config).requests
+    assert request["id"] == "1"
+    assert request["body"] == b"\x00Hello"
+    assert request["group"] == "key"
+    assert request["scope"]["path"] == "/kinesis"
+    assert request["scope"]["headers"] == []
+    assert request["scope"]["aws.record"] is record
+
+
+def test_dynamodb_requests() -> None:
+    new_image = {
+        "Id": {"N": "101"},
+        "Price": {"N": "-1.5"},
+        "Message": {"S": "New item!"},
+        "Tags": {"SS": ["a", "b"]},
+        "Scores": {"NS": ["1", "2.5"]},
+        "Data": {"B": "AAE="},
+        "Active": {"BOOL": True},
+        "Missing": {"NULL": True},
+        "Items": {"L": [{"N": "1"}, {"M": {"Name": {"S": "x"}}}]},
+    }
+    event = {
+        "Records": [
+            get_mock_dynamodb_record("111", 101, new_image=new_image),
+            get_mock_dynamodb_record("222", 101, event_name="REMOVE"),
+        ]
+    }
+    config = LambdaConfig()
+    assert DynamoDBStreams.infer(event, {}, config)
+    assert not Kinesis.infer(event, {}, config)
+
+    insert, remove = DynamoDBStreams(event, {}, config).requests
+    assert insert["id"] == "111"
+    assert json.loads(insert["body"]) == {
+        "Id": 101,
+        "Price": -1.5,
+        "Message": "New item!",
+        "Tags": ["a", "b"],
+        "Scores": [1, 2.5],
+        "Data": "AAE=",
+        "Active": True,
+        "Missing": None,
+        "Items": [1, {"Name": "x"}],
+    }
+    assert insert["scope"]["headers"] == [[b"content-type", b"application/json"]]
+    assert insert["scope"]["path"] == "/dynamodb"
+    assert remove["id"] == "222"
+    assert remove["body"] == b""
+    assert remove["scope"]["headers"] == []
+    assert insert["group"] == remove["group"] == '{"Id": {"N": "101"}}'
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [({"N": "10"}, 10), ({"N": "-3"}, -3), ({"N": "1e3"}, 1000.0), ({"S": "text"}, "text")],
+)
+def test_deserialize_attribute_value(value, expected) -> None:
+    assert deserialize_attribute_value(value) == expected
+
+
+def test_kinesis_ordered_per_key() -> None:
+    calls = []
+
+    async def app(scope, receive, send):
+        message = await receive()
+        calls.append(message["body"])
+        await asyncio.sleep(0.01 if message["body"] == b"a1" else 0)
+        status = 500 if message["body"] == b"b2" else 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    event = {
+        "Records": [
+            get_mock_kinesis_record("1", "a", b"a1"),
+            get_mock_kinesis_record("2", "b", b"b1"),
+            get_mock_kinesis_record("3", "a", b"a2"),
+            get_mock_kinesis_record("4", "b", b"b2"),
+            get_mock_kinesis_record("5", "b", b"b3"),
+            get_mock_kinesis_record("6", "c", b"c1"),
+        ]
+    }
+    handler = Mangum(app, lifespan="off")
+
+    # Only the first failed record is reported, the stream is checkpointed before it.
+    assert handler(event, {}) == {"batchItemFailures": [{"itemIdentifier": "4"}]}
+    # The keys run concurrently, the records of a key in order, and the records of a key
+    # after a failed record are not run.
+    assert calls == [b"a1", b"b1", b"c1", b"b2", b"a2"]
+
+
+def test_dynamodb_stream() -> None:
+    async def app(scope, receive, send):
+        message = await receive()
+        assert json.loads(message["body"]) == {"Id": 1}
+        status = 204 if scope["path"] == "/items" else 404
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    event = {"Records": [get_mock_dynamodb_record("1", 1, new_image={"Id": {"N": "1"}})]}
+    handler = Mangum(app, lifespan="off", event_routes={"aws:dynamodb": "/items"})
+    assert handler(event, {}) == {"batchItemFailures": []}
@@ -0,0 +1,255 @@
+import asyncio
+import base64
+
+import pytest
+
+from mangum import Mangum
+from mangum.exceptions import UnexpectedMessage
+from mangum.handlers import APIGatewayWebSocket
+from mangum.types import LambdaConfig
+from mangum.websocket import ManagementAPI, MemoryConnectionStore
+
+
+def get_mock_websocket_event(event_type, connection_id="conn-1", body=None, is_base64_encoded=False, **extra):
+    route_key = {"CONNECT": "$connect", "MESSAGE": "$default", "DISCONNECT": "$disconnect"}[event_type]
+    event = {
+        "requestContext": {
+            "routeKey": route_key,
+            "eventType": event_type,
+            "messageDirection": "IN",
+            "stage": "prod",
+            "requestId": "request-id",
+            "domainName": "abc.execute-api.us-east-1.amazonaws.com",
+            "connectionId": connection_id,
+            "apiId": "abc",
+            "identity": {"sourceIp": "192.168.0.1"},
+            **extra,
+        },
+        "isBase64Encoded": is_base64_encoded,
+    }
+    if event_type == "CONNECT":
+        event["headers"] = {"Host": "abc.execute-api.us-east-1.amazonaws.com", "Sec-WebSocket-Protocol": "chat, json"}
+        event["multiValueHeaders"] = {
+            "Host": ["abc.execute-api.us-east-1.amazonaws.com"],
+            "Sec-WebSocket-Protocol": ["chat, json"],
+        }
+        event["queryStringParameters"] = {"token": "abc"}
+        event["multiValueQueryStringParameters"] = {"token": ["abc"]}
+    if body is not None:
+        event["body"] = body
+    return event
+
+
+class RecordingClient:
+    def __init__(self, fail=()):
+        self.posts = []
+        self.deleted = []
+        self.fail = fail
+
+    def post_to_connection(self, ConnectionId, Data):
+        if ConnectionId in self.fail:
+            raise RuntimeError("GoneException")
+        self.posts.append((ConnectionId, Data))
+
+    def delete_connection(self, ConnectionId):
+        if ConnectionId in self.fail:
+            raise RuntimeError("GoneException")
+        self.deleted.append(ConnectionId)
+
+
+async def chat_app(scope, receive, send):
+    assert scope["type"] == "websocket"
+    message = await receive()
+    assert message == {"type": "websocket.connect"}
+    await send({"type": "websocket.accept", "subprotocol": "chat"})
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("text") == "close":
+            await send({"type": "websocket.close", "code": 1000})
+            return
+        if message.get("text") is not None:
+            await send({"type": "websocket.send", "text": f"echo: {message['text']}"})
+            await send({"type": "websocket.send", "text": scope["query_string"].decode()})
+        else:
+            await send({"type": "websocket.send", "bytes": message["bytes"]})
+
+
+def test_websocket_infer_and_scope() -> None:
+    event = get_mock_websocket_event("CONNECT")
+    config = LambdaConfig(event_routes={"websocket": "/ws"})
+    assert APIGatewayWebSocket.infer(event, {}, config)
+    assert not APIGatewayWebSocket.infer({"requestContext": {"elb": {}}}, {}, config)
+
+    handler = APIGatewayWebSocket(event, {}, config)
+    assert handler.endpoint_url == "https://abc.execute-api.us-east-1.amazonaws.com/prod"
+    assert handler.message is None
+    assert handler.build_scope(None) == {
+        "type": "websocket",
+        "http_version": "1.1",
+        "headers": [
+            [b"host", b"abc.execute-api.us-east-1.amazonaws.com"],
+            [b"sec-websocket-protocol", b"chat, json"],
+        ],
+        "path": "/ws",
+        "raw_path": None,
+        "root_path": "",
+        "scheme": "wss",
+        "query_string": b"token=abc",
+        "server": ("abc.execute-api.us-east-1.amazonaws.com", 443),
+        "client": ("192.168.0.1", 0),
+        "subprotocols": ["chat", "json"],
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "aws.event": event,
+        "aws.context": {},
+    }
+
+
+def test_websocket_connection_lifecycle() -> None:
+    store = MemoryConnectionStore()
+    client = RecordingClient()
+    handler = Mangum(chat_app, lifespan="off", connection_store=store, management_api=ManagementAPI(client=client))
+
+    response = handler(get_mock_websocket_event("CONNECT"), {})
+    assert response == {"statusCode": 200, "headers": {"sec-websocket-protocol": "chat"}}
+    assert store.get("conn-1")["subprotocol"] == "chat"
+
+    response = handler(get_mock_websocket_event("MESSAGE", body="hello"), {})
+    assert response == {"statusCode": 200}
+    # The query string of the stored connection is used for the later events.
+    assert client.posts == [("conn-1", b"echo: hello"), ("conn-1", b"token=abc")]
+
+    body = base64.b64encode(b"\x00\x01").decode()
+    handler(get_mock_websocket_event("MESSAGE", body=body, is_base64_encoded=True), {})
+    assert client.posts[-1] == ("conn-1", b"\x00\x01")
+
+    response = handler(get_mock_websocket_event("DISCONNECT", disconnectStatusCode=1001), {})
+    assert response == {"statusCode": 200}
+    assert store.get("conn-1") is None
+
+
+def test_websocket_close() -> None:
+    store = MemoryConnectionStore()
+    client = RecordingClient()
+    handler = Mangum(chat_app, lifespan="off", connection_store=store, management_api=ManagementAPI(client=client))
+
+    handler(get_mock_websocket_event("CONNECT"), {})
+    assert handler(get_mock_websocket_event("MESSAGE", body="close"), {}) == {"statusCode": 200}
+    assert client.deleted == ["conn-1"]
+    assert store.get("conn-1") is None
+
+
+def test_websocket_disconnect_code() -> None:
+    codes = []
+
+    async def app(scope, receive, send):
+        await receive()
+        message = await receive()
+        codes.append(message["code"])
+        # The disconnect is received again if the application keeps receiving.
+        assert await receive() == message
+
+    handler = Mangum(app, lifespan="off")
+    handler(get_mock_websocket_event("DISCONNECT", disconnectStatusCode=1001), {})
+    assert codes == [1001]
+
+
+@pytest.mark.parametrize(
+    "messages,status",
+    [
+        ([], 403),
+        ([{"type": "websocket.close"}], 403),
+        ([{"type": "websocket.accept"}, {"type": "websocket.close"}], 403),
+        ([{"type": "websocket.send", "text": "too early"}], 500),
+    ],
+)
+def test_websocket_connect_denied(messages, status) -> None:
+    async def app(scope, receive, send):
+        await receive()
+        for message in messages:
+            await send(message)
+
+    store = MemoryConnectionStore()
+    handler = Mangum(app, lifespan="off", connection_store=store)
+    assert handler(get_mock_websocket_event("CONNECT"), {}) == {"statusCode": status}
+    assert store.get("conn-1") is None
+
+
+def test_websocket_connect_send_dropped(caplog) -> None:
+    async def app(scope, receive, send):
+        await receive()
+        await send({"type": "websocket.accept"})
+        await send({"type": "websocket.send", "text": "welcome"})
+
+    client = RecordingClient()
+    handler = Mangum(app, lifespan="off", management_api=ManagementAPI(client=client))
+    assert handler(get_mock_websocket_event("CONNECT"), {}) == {"statusCode": 200}
+    assert client.posts == []
+    assert "Messages cannot be sent to a WebSocket connection until it is open" in caplog.text
+
+
+def test_websocket_unknown_connection() -> None:
+    # The connection is rebuilt from the event if it is not stored.
+    client = RecordingClient()
+    handler = Mangum(chat_app, lifespan="off", management_api=ManagementAPI(client=client))
+    assert handler(get_mock_websocket_event("MESSAGE", body="hi"), {}) == {"statusCode": 200}
+    assert client.posts == [("conn-1", b"echo: hi"), ("conn-1", b"")]
+
+
+def test_websocket_error(caplog) -> None:
+    async def app(scope, receive, send):
+        raise RuntimeError()
+
+    handler = Mangum(app, lifespan="off")
+    assert handler(get_mock_websocket_event("MESSAGE", body="hi"), {}) == {"statusCode": 500}
+    assert "An error occurred running the application." in caplog.text
+
+
+def test_websocket_unexpected_message() -> None:
+    async def app(scope, receive, send):
+        await receive()
+        await send({"type": "websocket.close"})
+        with pytest.raises(UnexpectedMessage):
+            await send({"type": "websocket.send", "text": "closed"})
+
+    handler = Mangum(app, lifespan="off", management_api=ManagementAPI(client=RecordingClient()))
+    assert handler(get_mock_websocket_event("MESSAGE", body="hi"), {}) == {"statusCode": 200}
+
+
+def test_websocket_deadline(caplog, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        await asyncio.sleep(10)
+
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0)
+    assert handler(get_mock_websocket_event("MESSAGE", body="hi"), mock_lambda_context(50)) == {"statusCode": 504}
+    assert "WebSocket / cancelled, the invocation deadline was reached." in caplog.text
+
+
+def test_websocket_lifespan_state() -> None:
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    scope["state"].update({"greeting": "hello"})
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        await receive()
+        await send({"type": "websocket.send", "text": scope["state"]["greeting"]})
+
+    client = RecordingClient()
+    handler = Mangum(app, lifespan="on", management_api=ManagementAPI(client=client))
+    handler(get_mock_websocket_event("MESSAGE", body="hi"), {})
+    assert client.posts == [("conn-1", b"hello")]
+
+
+def test_websocket_pinned_handler_and_stream() -> None:
+    handler = Mangum(chat_app, lifespan="off", handler=APIGatewayWebSocket)
+    event = get_mock_websocket_event("CONNECT")
+    assert isinstance(handler.infer(event, {}), APIGatewayWebSocket)
+    with pytest.raises(RuntimeError, match="The responses to websocket events cannot be streamed."):
+        handler.stream(event, {}, None)
@@ -1,8 +1,11 @@
+import asyncio
+
 import pytest
 
 from mangum import Mangum
 from mangum.adapter import DEFAULT_TEXT_MIME_TYPES
 from mangum.exceptions import ConfigurationError
+from mangum.handlers import ALB, APIGateway, LambdaAtEdge
 from mangum.types import Receive, Scope, Send
 
 
@@ -12,9 +15,28 @@ async def app(scope: Scope, receive: Receive, send: Send): ...
 def test_default_settings():
     handler = Mangum(app)
     assert handler.lifespan == "auto"
+    assert handler.persistent_lifespan is False
+    assert handler.startup_mode == "invocation"
     assert handler.config["api_gateway_base_path"] == "/"
     assert sorted(handler.config["text_mime_types"]) == sorted(DEFAULT_TEXT_MIME_TYPES)
-    assert handler.config["exclude_headers"] == []
+    assert handler.config["exclude_headers"] == frozenset()
+
+
+def test_compiled_config():
+    handler = Mangum(app, api_gateway_base_path="api", exclude_headers=["X-Custom-Header"])
+    config = handler.config
+    assert config["api_gateway_base_path"] == "/api"
+    assert config["exclude_headers"] == frozenset({"x-custom-header"})
+    assert config.get("exclude_headers") is config.exclude_headers
+    assert config.get("unknown") is None
+    assert repr(config).startswith("LambdaConfig(api_gateway_base_path='/api', text_mime_types=[")
+
+    with pytest.raises(KeyError):
+        config["unknown"]
+    with pytest.raises(AttributeError):
+        config.api_gateway_base_path = "/"
+    with pytest.raises(AttributeError):
+        del config.exclude_headers
 
 
 @pytest.mark.parametrize(
@@ -24,6 +46,35 @@ def test_default_settings():
             {"lifespan": "unknown"},
             "Invalid argument supplied for `lifespan`. Choices are: auto|on|off",
         ),
+        (
+            {"startup": "unknown"},
+            "Invalid argument supplied for `startup`. Choices are: invocation|init",
+        ),
+        (
+            {"deadline_margin_ms": -1},
+            "Invalid argument supplied for `deadline_margin_ms`. Must be zero or greater.",
+        ),
+        (
+            {"defer_background_work": True},
+            "Invalid argument supplied for `defer_background_work`. "
+            "A persistent lifespan is required unless lifespan is off.",
+        ),
+        (
+            {"request_chunk_size": 0},
+            "Invalid argument supplied for `request_chunk_size`. Must be greater than zero.",
+        ),
+        (
+            {"compression_minimum_size": -1},
+            "Invalid argument supplied for `compression_minimum_size`. Must be zero or greater.",
+        ),
+        (
+            {"response_store_threshold": 0},
+            "Invalid argument supplied for `response_store_threshold`. Must be greater than zero.",
+        ),
+        (
+            {"batch_concurrency": 0},
+            "Invalid argument supplied for `batch_concurrency`. Must be greater than zero.",
+        ),
     ],
 )
 def test_invalid_options(arguments, message):
@@ -31,3 +82,101 @@ def test_invalid_options(arguments, message):
         Mangum(app, **arguments)
 
     assert str(exc.value) == message
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_loop_factory(mock_aws_api_gateway_event):
+    loops = []
+
+    def loop_factory():
+        loop = asyncio.new_event_loop()
+        loops.append(loop)
+        return loop
+
+    running_loops = []
+
+    async def app(scope, receive, send):
+        running_loops.append(asyncio.get_running_loop())
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    handler = Mangum(app, lifespan="off", loop_factory=loop_factory)
+    handler(mock_aws_api_gateway_event, {})
+    handler(mock_aws_api_gateway_event, {})
+
+    assert loops == [handler.loop]
+    assert running_loops == [handler.loop, handler.loop]
+
+
+class CountingHandlerMixin:
+    infer_calls = 0
+
+    @classmethod
+    def infer(cls, event, context, config):
+        cls.infer_calls += 1
+        return super().infer(event, context, config)
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_infer_cached(mock_aws_api_gateway_event):
+    class CountingALB(CountingHandlerMixin, ALB): ...
+
+    class CountingAPIGateway(CountingHandlerMixin, APIGateway): ...
+
+    class CountingLambdaAtEdge(CountingHandlerMixin, LambdaAtEdge): ...
+
+    handler = Mangum(app, custom_handlers=[CountingLambdaAtEdge, CountingALB, CountingAPIGateway])
+    for _ in range(3):
+        assert isinstance(handler.infer(mock_aws_api_gateway_event, {}), CountingAPIGateway)
+
+    # The preceding handlers that may match events with the same keys are checked again.
+    assert CountingLambdaAtEdge.infer_calls == 1
+    assert CountingALB.infer_calls == 3
+    assert CountingAPIGateway.infer_calls == 3
+    assert handler.inferred_handlers == {
+        frozenset(mock_aws_api_gateway_event): (CountingAPIGateway, (CountingALB,)),
+    }
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_infer_cached_custom_handler(mock_aws_api_gateway_event):
+    class CustomAPIGateway(APIGateway):
+        @classmethod
+        def infer(cls, event, context, config):
+            return super().infer(event, context, config) and event["path"] == "/custom"
+
+    handler = Mangum(app, custom_handlers=[CustomAPIGateway])
+    other_event = {**mock_aws_api_gateway_event, "path": "/other"}
+    assert type(handler.infer(other_event, {})) is APIGateway
+    custom_event = {**mock_aws_api_gateway_event, "path": "/custom"}
+    assert type(handler.infer(custom_event, {})) is CustomAPIGateway
+    assert type(handler.infer(other_event, {})) is APIGateway
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_infer_cached_mismatch(mock_aws_api_gateway_event):
+    alb_event = {**mock_aws_api_gateway_event, "requestContext": {"elb": {}}}
+    handler = Mangum(app)
+    assert isinstance(handler.infer(alb_event, {}), ALB)
+
+    # An event with the same top-level keys that does not match the cached handler is
+    # inferred again.
+    assert isinstance(handler.infer(mock_aws_api_gateway_event, {}), APIGateway)
+    assert handler.inferred_handlers == {frozenset(mock_aws_api_gateway_event): (APIGateway, (ALB,))}
+
+    # An event matched by the cached handler is inferred again if a preceding handler
+    # also matches it.
+    assert isinstance(handler.infer(alb_event, {}), ALB)
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_infer_pinned_handler(mock_aws_api_gateway_event, caplog):
+    class CountingAPIGateway(CountingHandlerMixin, APIGateway): ...
+
+    handler = Mangum(app, handler=CountingAPIGateway)
+    assert isinstance(handler.infer(mock_aws_api_gateway_event, {}), CountingAPIGateway)
+    assert CountingAPIGateway.infer_calls == 0
+
+    handler = Mangum(app, handler=LambdaAtEdge)
+    assert isinstance(handler.infer(mock_aws_api_gateway_event, {}), APIGateway)
+    assert "The event does not match the LambdaAtEdge handler, the handler will be inferred." in caplog.text
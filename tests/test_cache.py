@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import pytest
+
+from mangum import Mangum
+from mangum.cache import ResponseCache
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_response_cache(mock_http_api_event_v2, monkeypatch, make_app, mock_lambda_context) -> None:
+    now = 1000.0
+    monkeypatch.setattr("mangum.cache.time.monotonic", lambda: now)
+    app, calls = make_app([[b"content-type", b"text/plain"], [b"cache-control", b"public, max-age=60"]])
+    cache = ResponseCache()
+    handler = Mangum(app, lifespan="off", response_cache=cache)
+
+    response = handler(mock_http_api_event_v2, mock_lambda_context())
+    assert response["body"] == "/my/path? 1"
+    assert "age" not in response["headers"]
+
+    now += 30
+    response = handler(mock_http_api_event_v2, mock_lambda_context())
+    assert response["body"] == "/my/path? 1"
+    assert response["headers"]["age"] == "30"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.max_bytes == 128 * 1024 * 1024 // 10
+
+    mock_http_api_event_v2["rawQueryString"] = "page=2"
+    response = handler(mock_http_api_event_v2, mock_lambda_context())
+    assert response["body"] == "/my/path?page=2 2"
+
+    mock_http_api_event_v2["rawQueryString"] = ""
+    now += 30
+    response = handler(mock_http_api_event_v2, mock_lambda_context())
+    assert response["body"] == "/my/path? 3"
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_response_cache_vary(mock_http_api_event_v2, make_app) -> None:
+    app, calls = make_app([[b"cache-control", b"max-age=60"], [b"vary", b"Accept-Language, origin"]])
+    handler = Mangum(app, lifespan="off", response_cache=ResponseCache())
+
+    bodies = []
+    for language in ["en", "fr", "en", "fr"]:
+        mock_http_api_event_v2["headers"]["accept-language"] = language
+        bodies.append(handler(mock_http_api_event_v2, {})["body"])
+
+    assert bodies == ["/my/path? 1", "/my/path? 2", "/my/path? 1", "/my/path? 2"]
+    assert handler.response_cache.max_bytes == 16 * 1024 * 1024
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "headers,status",
+    [
+        ([], 200),
+        ([[b"cache-control", b"max-age=60, no-store"]], 200),
+        ([[b"cache-control", b"max-age=60, private"]], 200),
+        ([[b"cache-control", b"max-age=60, s-maxage=0"]], 200),
+        ([[b"cache-control", b"max-age=invalid"]], 200),
+        ([[b"cache-control", b"max-age=60"], [b"set-cookie", b"cookie1=cookie1"]], 200),
+        ([[b"cache-control", b"max-age=60"], [b"vary", b"*"]], 200),
+        ([[b"cache-control", b"max-age=60"]], 404),
+    ],
+)
+def test_response_cache_not_cacheable(mock_http_api_event_v2, headers, status, make_app) -> None:
+    app, calls = make_app(headers, status)
+    cache = ResponseCache()
+    handler = Mangum(app, lifespan="off", response_cache=cache)
+    handler(mock_http_api_event_v2, {})
+    handler(mock_http_api_event_v2, {})
+
+    assert len(calls) == 2
+    assert not cache.entries
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["POST", None, None, ""]],
+    indirect=True,
+)
+def test_response_cache_post(mock_http_api_event_v2, make_app) -> None:
+    app, calls = make_app([[b"cache-control", b"max-age=60"]])
+    cache = ResponseCache()
+    handler = Mangum(app, lifespan="off", response_cache=cache)
+    handler(mock_http_api_event_v2, {})
+    handler(mock_http_api_event_v2, {})
+
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "max_entries,max_bytes,expected_calls",
+    [
+        (2, None, 2),
+        (1, None, 5),
+        (2, 70, 2),
+        (2, 69, 5),
+        (2, 10, 5),
+    ],
+)
+def test_response_cache_bounds(mock_http_api_event_v2, max_entries, max_bytes, expected_calls, make_app) -> None:
+    # Each response is 35 bytes.
+    app, calls = make_app([[b"cache-control", b"max-age=60"]])
+    handler = Mangum(app, lifespan="off", response_cache=ResponseCache(max_entries, max_bytes))
+    for query_string in ["a", "b", "a", "b", "a"]:
+        mock_http_api_event_v2["rawQueryString"] = query_string
+        handler(mock_http_api_event_v2, {})
+
+    assert len(calls) == expected_calls
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_response_cache_replaced(mock_http_api_event_v2, make_app) -> None:
+    app, calls = make_app([[b"cache-control", b"max-age=60"]])
+    cache = ResponseCache()
+    handler = Mangum(app, lifespan="off", response_cache=cache)
+    handler(mock_http_api_event_v2, {})
+    cache.put(calls[0], {"status": 200, "headers": [[b"cache-control", b"max-age=60"]], "body": b"replaced"})
+
+    assert handler(mock_http_api_event_v2, {})["body"] == "replaced"
+    assert cache.size == len(b"replaced") + len(b"cache-control") + len(b"max-age=60")
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "cache_control,cached",
+    [
+        (b"max-age=60", False),
+        (b"public, max-age=60", True),
+        (b"s-maxage=60", True),
+        (b"max-age=60, must-revalidate", True),
+    ],
+)
+def test_response_cache_authorization(mock_http_api_event_v2, cache_control, cached) -> None:
+    async def app(scope, receive, send):
+        user = dict(scope["headers"]).get(b"authorization", b"anonymous")
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"cache-control", cache_control]]})
+        await send({"type": "http.response.body", "body": b"profile of " + user})
+
+    cache = ResponseCache()
+    handler = Mangum(app, lifespan="off", response_cache=cache)
+    mock_http_api_event_v2["headers"]["authorization"] = "alice"
+    assert handler(mock_http_api_event_v2, {})["body"] == "profile of alice"
+    mock_http_api_event_v2["headers"]["authorization"] = "bob"
+    assert handler(mock_http_api_event_v2, {})["body"] == "profile of bob"
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert bool(cache.entries) is cached
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_response_cache_host(mock_http_api_event_v2, make_app) -> None:
+    app, calls = make_app([[b"cache-control", b"max-age=60"]])
+    handler = Mangum(app, lifespan="off", response_cache=ResponseCache())
+    for host in ["a.example.com", "b.example.com", "a.example.com", "b.example.com"]:
+        mock_http_api_event_v2["headers"]["host"] = host
+        handler(mock_http_api_event_v2, {})
+
+    assert [dict(scope["headers"])[b"host"] for scope in calls] == [b"a.example.com", b"b.example.com"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import base64
+import gzip
+
+import brotli
+import pytest
+
+from mangum import Mangum
+from mangum.compression import compress_response, get_accepted_encodings
+
+TEXT_MIME_TYPES = ["text/", "application/json"]
+BODY = b"Hello, world! " * 100
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("", []),
+        ("gzip", ["gzip"]),
+        ("gzip, deflate, br", ["gzip", "br"]),
+        ("GZIP;q=0.5, br;q=0", ["gzip"]),
+        ("*", ["gzip", "br"]),
+        ("*;q=0.1, gzip;q=0", ["br"]),
+        ("br;q=invalid, identity", []),
+    ],
+)
+def test_get_accepted_encodings(accept_encoding, expected) -> None:
+    assert get_accepted_encodings(accept_encoding) == expected
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_compression_gzip(mock_http_api_event_v2, make_app) -> None:
+    app, _ = make_app([[b"content-type", b"text/plain; charset=utf-8"], [b"content-length", b"1400"]], body=BODY)
+    handler = Mangum(app, lifespan="off", compression_minimum_size=1000)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["isBase64Encoded"]
+    assert response["headers"] == {
+        "content-type": "text/plain; charset=utf-8",
+        "content-encoding": "gzip",
+        "content-length": str(len(base64.b64decode(response["body"]))),
+        "vary": "accept-encoding",
+    }
+    assert gzip.decompress(base64.b64decode(response["body"])) == BODY
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_compression_cheapest_encoding(mock_http_api_event_v2, make_app) -> None:
+    mock_http_api_event_v2["headers"]["accept-encoding"] = "gzip, br"
+    app, _ = make_app([[b"content-type", b"application/json"], [b"vary", b"origin"]], body=BODY)
+    handler = Mangum(app, lifespan="off", compression_minimum_size=0)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["headers"]["content-encoding"] == "br"
+    assert response["headers"]["vary"] == "origin, accept-encoding"
+    assert "content-length" not in response["headers"]
+    assert brotli.decompress(base64.b64decode(response["body"])) == BODY
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "vary,expected",
+    [
+        ([b"Origin", b"Cookie"], "Origin, Cookie, accept-encoding"),
+        ([b"Origin", b"Accept-Encoding"], "Origin, Accept-Encoding"),
+    ],
+)
+def test_compression_repeated_vary(mock_http_api_event_v2, vary, expected, make_app) -> None:
+    app, _ = make_app([[b"content-type", b"application/json"], *([b"vary", value] for value in vary)], body=BODY)
+    handler = Mangum(app, lifespan="off", compression_minimum_size=0)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["headers"]["vary"] == expected
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "headers,body",
+    [
+        ([[b"content-type", b"text/plain"]], b"Hello"),
+        ([[b"content-type", b"image/png"]], BODY),
+        ([[b"content-type", b"text/plain"], [b"content-encoding", b"gzip"]], BODY),
+        ([[b"content-type", b"text/plain"], [b"content-range", b"bytes 0-1399/2000"]], BODY),
+        ([[b"content-type", b"text/plain"], [b"cache-control", b"no-transform"]], BODY),
+    ],
+)
+def test_compression_skipped(mock_http_api_event_v2, headers, body, make_app) -> None:
+    app, _ = make_app(headers, body=body)
+    handler = Mangum(app, lifespan="off", compression_minimum_size=10)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert "content-encoding" not in response["headers"] or headers[-1][0] == b"content-encoding"
+    assert "vary" not in response["headers"]
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_compression_not_accepted(mock_http_api_event_v2, make_app) -> None:
+    mock_http_api_event_v2["headers"]["accept-encoding"] = "identity"
+    app, _ = make_app([[b"content-type", b"text/plain"], [b"vary", b"Accept-Encoding"]], body=BODY)
+    handler = Mangum(app, lifespan="off", compression_minimum_size=0)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["isBase64Encoded"] is False
+    assert response["headers"]["vary"] == "Accept-Encoding"
+    assert response["body"] == BODY.decode()
+
+
+def test_compression_not_smaller_once_encoded() -> None:
+    # Random bytes do not compress, so the body is returned as is.
+    body = bytes(range(256))
+    response = compress_response(
+        {"status": 200, "headers": [[b"content-type", b"text/plain"]], "body": body},
+        {"headers": [[b"accept-encoding", b"gzip"]]},
+        text_mime_types=TEXT_MIME_TYPES,
+        minimum_size=0,
+    )
+
+    assert response == {
+        "status": 200,
+        "headers": [[b"content-type", b"text/plain"], [b"vary", b"accept-encoding"]],
+        "body": body,
+    }
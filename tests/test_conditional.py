@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from mangum import Mangum
+from mangum.cache import ResponseCache
+
+BODY = b'{"flags": []}'
+ETAG = '"%s"' % hashlib.blake2b(BODY, digest_size=16).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize("content_type", ["application/json", "text/html; charset=utf-8"])
+def test_etag(mock_http_api_event_v2, content_type, make_app) -> None:
+    app, _ = make_app([[b"content-type", content_type.encode()], [b"cache-control", b"no-cache"]], body=BODY)
+    handler = Mangum(app, lifespan="off", etag=True)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["etag"] == ETAG
+    assert response["body"] == BODY.decode()
+
+    mock_http_api_event_v2["headers"]["if-none-match"] = f'"other", W/{ETAG}'
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response == {
+        "statusCode": 304,
+        "headers": {"content-type": content_type, "cache-control": "no-cache", "etag": ETAG},
+        "body": "",
+        "isBase64Encoded": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "headers,if_none_match,status_code",
+    [
+        ([[b"etag", b'W/"app"']], '"app"', 304),
+        ([[b"etag", b'W/"app"']], "*", 304),
+        ([[b"etag", b'"app"']], '"other"', 200),
+        ([], None, 200),
+    ],
+)
+def test_etag_set_by_app(mock_http_api_event_v2, headers, if_none_match, status_code, make_app) -> None:
+    if if_none_match is not None:
+        mock_http_api_event_v2["headers"]["if-none-match"] = if_none_match
+    app, _ = make_app(headers, body=BODY)
+    response = Mangum(app, lifespan="off", etag=True)(mock_http_api_event_v2, {})
+
+    assert response["statusCode"] == status_code
+    assert response["headers"]["etag"] == (headers[0][1].decode() if headers else ETAG)
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2,status",
+    [
+        (["GET", None, None, ""], 404),
+        (["POST", None, None, ""], 200),
+    ],
+    indirect=["mock_http_api_event_v2"],
+)
+def test_etag_skipped(mock_http_api_event_v2, status, make_app) -> None:
+    mock_http_api_event_v2["headers"]["if-none-match"] = "*"
+    app, _ = make_app([], status, body=BODY)
+    response = Mangum(app, lifespan="off", etag=True)(mock_http_api_event_v2, {})
+
+    assert response["statusCode"] == status
+    assert "etag" not in response["headers"]
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_etag_cached(mock_http_api_event_v2, make_app) -> None:
+    app, calls = make_app([[b"cache-control", b"max-age=60"]], body=BODY)
+    handler = Mangum(app, lifespan="off", etag=True, response_cache=ResponseCache())
+    handler(mock_http_api_event_v2, {})
+
+    mock_http_api_event_v2["headers"]["if-none-match"] = ETAG
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["statusCode"] == 304
+    assert response["headers"]["etag"] == ETAG
+    assert len(calls) == 1
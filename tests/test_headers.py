@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from mangum.headers import ENCODED_HEADER_NAMES, decode_headers, encode_headers
+
+
+def test_encode_headers() -> None:
+    headers = encode_headers({"content-type": "text/plain", "x-name": "café", "x-emoji": "☃"})
+
+    assert headers == [
+        [b"content-type", b"text/plain"],
+        [b"x-name", b"caf\xe9"],
+        [b"x-emoji", "☃".encode()],
+    ]
+    assert headers[0][0] is ENCODED_HEADER_NAMES["content-type"]
+
+
+def test_decode_headers() -> None:
+    headers = decode_headers(
+        [
+            [b"Content-Type", b"text/plain"],
+            [b"set-cookie", b"a=b"],
+            (b"x-name", "café".encode()),
+            (b"x-latin-1", b"caf\xe9"),
+        ]
+    )
+
+    assert headers == [
+        ("content-type", "text/plain"),
+        ("set-cookie", "a=b"),
+        ("x-name", "café"),
+        ("x-latin-1", "café"),
+    ]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import gzip
 import json
+import time
 
 import brotli
 import pytest
@@ -12,6 +14,7 @@ from starlette.middleware.gzip import GZipMiddleware
 from starlette.responses import PlainTextResponse
 
 from mangum import Mangum
+from mangum.protocols import HTTPCycle
 
 
 @pytest.mark.parametrize(
@@ -23,6 +26,7 @@ def test_http_response(mock_aws_api_gateway_event) -> None:
     async def app(scope, receive, send):
         assert scope == {
             "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "extensions": {"http.response.pathsend": {}, "http.response.zerocopysend": {}},
             "aws.context": {},
             "aws.event": {
                 "body": None,
@@ -264,6 +268,7 @@ def test_set_cookies_v2(mock_http_api_event_v2) -> None:
     async def app(scope, receive, send):
         assert scope == {
             "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "extensions": {"http.response.pathsend": {}, "http.response.zerocopysend": {}},
             "aws.context": {},
             "aws.event": {
                 "version": "2.0",
@@ -379,6 +384,7 @@ def test_set_cookies_v1(mock_http_api_event_v1) -> None:
     async def app(scope, receive, send):
         assert scope == {
             "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "extensions": {"http.response.pathsend": {}, "http.response.zerocopysend": {}},
             "aws.context": {},
             "aws.event": {
                 "version": "1.0",
@@ -607,3 +613,324 @@ def test_http_logging(mock_aws_api_gateway_event, caplog: pytest.LogCaptureFixtu
     }
 
     assert "GET /test/hello 200" in caplog.text
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_deadline(mock_aws_api_gateway_event, caplog: pytest.LogCaptureFixture, mock_lambda_context) -> None:
+    cancelled = False
+
+    async def app(scope, receive, send):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=950)
+    response = handler(mock_aws_api_gateway_event, mock_lambda_context(1000))
+
+    assert cancelled
+    assert response == {
+        "statusCode": 504,
+        "isBase64Encoded": False,
+        "headers": {"content-type": "text/plain; charset=utf-8"},
+        "multiValueHeaders": {},
+        "body": "Gateway Timeout",
+    }
+    assert "GET /test/hello cancelled after" in caplog.text
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_deadline_mid_response(mock_aws_api_gateway_event, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello", "more_body": True})
+        await asyncio.sleep(10)
+
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=1000)
+    response = handler(mock_aws_api_gateway_event, mock_lambda_context(500))
+
+    assert response["statusCode"] == 504
+    assert response["body"] == "Gateway Timeout"
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_deadline_not_reached(mock_aws_api_gateway_event, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=500)
+    response = handler(mock_aws_api_gateway_event, mock_lambda_context(3000))
+    assert response["statusCode"] == 200
+
+    # The deadline is not applied if the context does not provide the remaining time.
+    response = handler(mock_aws_api_gateway_event, {})
+    assert response["statusCode"] == 200
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_defer_background_work(mock_aws_api_gateway_event) -> None:
+    events = []
+
+    async def app(scope, receive, send):
+        request_number = len([event for event in events if event.startswith("request")]) + 1
+        events.append(f"request {request_number}")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+        await asyncio.sleep(0.01)
+        events.append(f"background {request_number}")
+
+    handler = Mangum(app, lifespan="off", defer_background_work=True)
+    response = handler(mock_aws_api_gateway_event, {})
+    assert response["statusCode"] == 200
+    assert events == ["request 1"]
+
+    # The remaining work is completed before the next invocation is handled.
+    handler(mock_aws_api_gateway_event, {})
+    assert events == ["request 1", "background 1", "request 2"]
+
+    handler.shutdown()
+    assert events == ["request 1", "background 1", "request 2", "background 2"]
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_defer_background_work_timeout(mock_aws_api_gateway_event, caplog: pytest.LogCaptureFixture) -> None:
+    cancelled = False
+
+    async def app(scope, receive, send):
+        nonlocal cancelled
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    handler = Mangum(app, lifespan="off", defer_background_work=True, background_timeout_ms=10)
+    handler(mock_aws_api_gateway_event, {})
+    handler.drain_background_work({})
+
+    assert cancelled
+    assert "GET /test/hello background work cancelled after 10 ms." in caplog.text
+    assert "An error occurred running the application." not in caplog.text
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_defer_background_work_deadline(
+    mock_aws_api_gateway_event, caplog: pytest.LogCaptureFixture, mock_lambda_context
+) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+        if scope["path"] == "/test/hello":
+            await asyncio.sleep(10)
+
+    handler = Mangum(app, lifespan="off", defer_background_work=True, deadline_margin_ms=100)
+    handler(mock_aws_api_gateway_event, mock_lambda_context(3000))
+
+    # The remaining work is cancelled before the deadline of the next invocation, which
+    # is sooner than `background_timeout_ms`.
+    start = time.monotonic()
+    response = handler({**mock_aws_api_gateway_event, "path": "/test/other"}, mock_lambda_context(150))
+    assert time.monotonic() - start < 1
+    assert response["statusCode"] == 200
+    assert "GET /test/hello background work cancelled after 50 ms." in caplog.text
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_deadline_background_work(mock_aws_api_gateway_event, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+        await asyncio.sleep(10)
+
+    # The response is returned when the deadline is reached after it was completed.
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0)
+    response = handler(mock_aws_api_gateway_event, mock_lambda_context(10))
+    assert response["statusCode"] == 200
+    assert response["body"] == "SGVsbG8sIHdvcmxkIQ=="
+    assert handler.background_cycles == []
+
+
+@pytest.mark.parametrize(
+    "chunks,expected",
+    [
+        ([], b""),
+        ([b"Hello, world!"], b"Hello, world!"),
+        ([bytearray(b"Hello, world!")], b"Hello, world!"),
+        ([b"Hello", b"", b", ", b"world!"], b"Hello, world!"),
+    ],
+)
+def test_http_cycle_body_chunks(chunks, expected) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    loop = asyncio.new_event_loop()
+    try:
+        http_cycle = HTTPCycle({"type": "http", "method": "GET", "path": "/"}, b"", loop)
+        response = http_cycle(app)
+    finally:
+        loop.close()
+
+    assert response["body"] == expected
+    assert type(response["body"]) is bytes
+    if len(chunks) == 1 and type(chunks[0]) is bytes:
+        # A body sent in a single message is not copied.
+        assert response["body"] is chunks[0]
+
+
+@pytest.mark.parametrize(
+    "mock_aws_api_gateway_event,is_base64",
+    [
+        (["POST", base64.b64encode(b"Hello, world!").decode(), None], True),
+        (["POST", "Hello, world!", None], False),
+        (["POST", b"Hello, world!", None], False),
+    ],
+    indirect=["mock_aws_api_gateway_event"],
+)
+def test_http_request_body_chunks(mock_aws_api_gateway_event, is_base64) -> None:
+    mock_aws_api_gateway_event["isBase64Encoded"] = is_base64
+    messages = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            messages.append(message)
+            if not message["more_body"]:
+                break
+
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    handler = Mangum(app, lifespan="off", request_chunk_size=3)
+    response = handler(mock_aws_api_gateway_event, {})
+
+    assert response["statusCode"] == 204
+    assert [message["body"] for message in messages] == [b"Hel", b"lo,", b" wo", b"rld", b"!"]
+    assert [message["more_body"] for message in messages] == [True, True, True, True, False]
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["POST", None, None]], indirect=True)
+def test_http_request_body_chunks_empty(mock_aws_api_gateway_event) -> None:
+    messages = []
+
+    async def app(scope, receive, send):
+        messages.append(await receive())
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    handler = Mangum(app, lifespan="off", request_chunk_size=4)
+    handler(mock_aws_api_gateway_event, {})
+
+    assert messages == [{"type": "http.request", "body": b"", "more_body": False}]
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_disconnect(mock_aws_api_gateway_event) -> None:
+    messages = []
+
+    async def app(scope, receive, send):
+        async def wait_for_disconnect():
+            messages.append(await receive())
+
+        messages.append(await receive())
+        task = asyncio.ensure_future(wait_for_disconnect())
+        await asyncio.sleep(0)
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+        await task
+        messages.append(await receive())
+
+    handler = Mangum(app, lifespan="off")
+    response = handler(mock_aws_api_gateway_event, {})
+
+    assert response["statusCode"] == 204
+    assert [message["type"] for message in messages] == ["http.request", "http.disconnect", "http.disconnect"]
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_text_response_invalid_utf8(mock_aws_api_gateway_event) -> None:
+    body = "Hello, world!".encode("utf-16")
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"text/plain"]]})
+        await send({"type": "http.response.body", "body": body})
+
+    handler = Mangum(app, lifespan="off")
+    response = handler(mock_aws_api_gateway_event, {})
+
+    assert response["isBase64Encoded"]
+    assert response["body"] == base64.b64encode(body).decode()
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_response_pathsend(mock_aws_api_gateway_event, tmp_path) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG" + bytes(range(256)))
+
+    async def app(scope, receive, send):
+        assert "http.response.pathsend" in scope["extensions"]
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"image/png"]]})
+        await send({"type": "http.response.pathsend", "path": str(path)})
+
+    handler = Mangum(app, lifespan="off")
+    response = handler(mock_aws_api_gateway_event, {})
+
+    assert response["isBase64Encoded"]
+    assert base64.b64decode(response["body"]) == path.read_bytes()
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_response_zerocopysend(mock_aws_api_gateway_event, tmp_path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"Hello, world!")
+    empty_path = tmp_path / "empty.txt"
+    empty_path.write_bytes(b"")
+
+    async def app(scope, receive, send):
+        assert "http.response.zerocopysend" in scope["extensions"]
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"text/plain"]]})
+        with open(path, "rb") as file:
+            file.seek(7)
+            await send({"type": "http.response.zerocopysend", "file": file, "count": 5, "more_body": True})
+            assert file.tell() == 12
+            await send({"type": "http.response.zerocopysend", "file": file.fileno(), "more_body": True})
+            assert file.tell() == 13
+            await send({"type": "http.response.zerocopysend", "file": file, "offset": 5, "count": 2, "more_body": True})
+            await send({"type": "http.response.zerocopysend", "file": file, "offset": 0, "count": 5, "more_body": True})
+        with open(empty_path, "rb") as file:
+            await send({"type": "http.response.zerocopysend", "file": file})
+
+    handler = Mangum(app, lifespan="off")
+    response = handler(mock_aws_api_gateway_event, {})
+
+    assert response["body"] == "world!, Hello"
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_http_response_pathsend_stream(mock_aws_api_gateway_event, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("mangum.protocols.http.FILE_CHUNK_SIZE", 4)
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"Hello, world!")
+    chunks = []
+
+    class RecordingStreamWriter:
+        def write(self, data: bytes) -> None:
+            chunks.append(data)
+
+        def close(self) -> None: ...
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [[b"content-type", b"text/plain"]]})
+        await send({"type": "http.response.pathsend", "path": str(path)})
+
+    handler = Mangum(app, lifespan="off")
+    handler.stream(mock_aws_api_gateway_event, {}, RecordingStreamWriter())
+
+    assert chunks[1:] == [b"Hell", b"o, w", b"orld", b"!"]
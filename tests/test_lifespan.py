@@ -1,4 +1,6 @@
 import logging
+import os
+import signal
 
 import pytest
 from quart import Quart
@@ -338,3 +340,175 @@ def test_quart_lifespan(mock_aws_api_gateway_event) -> None:
         "multiValueHeaders": {},
         "body": "hello world!",
     }
+
+
+@pytest.fixture
+def sigterm_handler():
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, previous_handler)
+
+
+@pytest.mark.parametrize(
+    "mock_aws_api_gateway_event,lifespan",
+    [(["GET", None, None], "auto"), (["GET", None, None], "on")],
+    indirect=["mock_aws_api_gateway_event"],
+)
+def test_persistent_lifespan(mock_aws_api_gateway_event, lifespan, sigterm_handler) -> None:
+    startup_count = 0
+    shutdown_count = 0
+
+    async def app(scope, receive, send):
+        nonlocal startup_count, shutdown_count
+
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    scope["state"].update({"startup_count": startup_count + 1})
+                    await send({"type": "lifespan.startup.complete"})
+                    startup_count += 1
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    shutdown_count += 1
+                    return
+
+        if scope["type"] == "http":
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [[b"content-type", b"text/plain; charset=utf-8"]],
+                }
+            )
+            await send({"type": "http.response.body", "body": str(scope["state"]["startup_count"]).encode()})
+
+    handler = Mangum(app, lifespan=lifespan, persistent_lifespan=True)
+    for _ in range(3):
+        response = handler(mock_aws_api_gateway_event, {})
+        assert response["body"] == "1"
+
+    assert startup_count == 1
+    assert shutdown_count == 0
+
+    handler.shutdown()
+    assert shutdown_count == 1
+
+    # A new cycle is started if the adapter is invoked again after shutdown.
+    handler(mock_aws_api_gateway_event, {})
+    assert startup_count == 2
+    handler.shutdown()
+
+
+def test_persistent_lifespan_sigterm(sigterm_handler) -> None:
+    shutdown_complete = False
+    received_signals = []
+
+    async def app(scope, receive, send):
+        nonlocal shutdown_complete
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                shutdown_complete = True
+                return
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: received_signals.append(signum))
+    handler = Mangum(app, persistent_lifespan=True)
+    handler.startup()
+
+    signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+    assert shutdown_complete
+    assert received_signals == [signal.SIGTERM]
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    handler.startup()
+    with pytest.raises(SystemExit):
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+
+def test_persistent_lifespan_sigterm_after_restart(sigterm_handler) -> None:
+    shutdown_count = 0
+    received_signals = []
+
+    async def app(scope, receive, send):
+        nonlocal shutdown_count
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                shutdown_count += 1
+                return
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: received_signals.append(signum))
+    handler = Mangum(app, persistent_lifespan=True)
+    handler.startup()
+    handler.shutdown()
+    handler.startup()
+
+    # The previous handler is still the one installed before the first cycle.
+    os.kill(os.getpid(), signal.SIGTERM)
+    assert shutdown_count == 2
+    assert received_signals == [signal.SIGTERM]
+
+
+@pytest.mark.parametrize(
+    "mock_aws_api_gateway_event,lifespan",
+    [(["GET", None, None], "auto"), (["GET", None, None], "on")],
+    indirect=["mock_aws_api_gateway_event"],
+)
+def test_lifespan_startup_init(mock_aws_api_gateway_event, lifespan, sigterm_handler) -> None:
+    startup_count = 0
+
+    async def app(scope, receive, send):
+        nonlocal startup_count
+
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    startup_count += 1
+                    if startup_count == 1:
+                        await send({"type": "lifespan.startup.failed", "message": "Failed."})
+                    else:
+                        await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] == "http":
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [[b"content-type", b"text/plain; charset=utf-8"]],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+    handler = Mangum(app, lifespan=lifespan, startup="init")
+    assert handler.persistent_lifespan
+    assert startup_count == 1
+
+    # The failure from the INIT phase is raised on the first invocation only.
+    with pytest.raises(LifespanFailure):
+        handler(mock_aws_api_gateway_event, {})
+
+    response = handler(mock_aws_api_gateway_event, {})
+    assert response["body"] == "Hello, world!"
+    assert startup_count == 2
+
+    handler(mock_aws_api_gateway_event, {})
+    assert startup_count == 2
+    handler.shutdown()
+
+
+def test_lifespan_startup_init_off() -> None:
+    async def app(scope, receive, send): ...  # pragma: no cover
+
+    handler = Mangum(app, lifespan="off", startup="init")
+    assert handler.lifespan_cycle is None
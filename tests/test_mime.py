@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from mangum.handlers.utils import handle_base64_response_body
+from mangum.mime import TextMimeTypes, parse_content_type
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        ("text/html", ("text/html", None)),
+        ("Application/JSON; Charset=UTF-8", ("application/json", "utf-8")),
+        ('text/plain; format=flowed; charset="ISO-8859-1"', ("text/plain", "iso-8859-1")),
+        ("", ("", None)),
+    ],
+)
+def test_parse_content_type(content_type, expected) -> None:
+    assert parse_content_type(content_type) == expected
+
+
+@pytest.mark.parametrize(
+    "content_type,is_text",
+    [
+        ("text/plain", True),
+        ("TEXT/HTML; charset=utf-8", True),
+        ("application/json; charset=us-ascii", True),
+        ("application/problem+json", True),
+        ("text/plain; charset=iso-8859-1", True),
+        ("text/plain; charset=utf-16", False),
+        ("text/plain; charset=UTF-32LE", False),
+        ("image/png", False),
+        ("", False),
+    ],
+)
+def test_text_mime_types(content_type, is_text) -> None:
+    text_mime_types = TextMimeTypes(["text/", "+json", "application/json"])
+
+    assert text_mime_types.is_text(content_type) is is_text
+    assert text_mime_types.is_text(content_type) is is_text
+
+
+def test_text_mime_types_changed() -> None:
+    text_mime_types = TextMimeTypes(["text/"])
+    assert not text_mime_types.is_text("application/x-yaml")
+
+    text_mime_types.append("application/x-yaml")
+    assert text_mime_types.is_text("application/x-yaml")
+
+    text_mime_types.sort(key=len, reverse=True)
+    del text_mime_types[0]
+    assert text_mime_types == ["text/"]
+    assert not text_mime_types.is_text("application/x-yaml")
+
+
+@pytest.mark.parametrize(
+    "text_mime_types",
+    [["text/"], TextMimeTypes(["text/"])],
+)
+def test_handle_base64_response_body(text_mime_types) -> None:
+    assert handle_base64_response_body(b"caf\xc3\xa9", {"content-type": "text/plain"}, text_mime_types) == (
+        "café",
+        False,
+    )
+    # A body in an ASCII-compatible charset is returned as text if it is valid UTF-8.
+    assert handle_base64_response_body(
+        b"a,b\n1,2", {"content-type": "text/csv; charset=iso-8859-1"}, text_mime_types
+    ) == (
+        "a,b\n1,2",
+        False,
+    )
+    assert handle_base64_response_body(
+        b"caf\xe9", {"content-type": "text/plain; charset=latin-1"}, text_mime_types
+    ) == (
+        "Y2Fm6Q==",
+        True,
+    )
+    # The body is not decoded as UTF-8 if the charset is not compatible with ASCII.
+    assert handle_base64_response_body(b"cafe", {"content-type": "text/plain; charset=utf-16"}, text_mime_types) == (
+        "Y2FmZQ==",
+        True,
+    )
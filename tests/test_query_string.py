@@ -0,0 +1,61 @@
+from urllib.parse import unquote_plus, urlencode
+
+import pytest
+
+from mangum.query_string import (
+    build_query_string,
+    encode_query_string,
+    get_query_string,
+    quote_plus,
+    requote_plus,
+)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"name": "me"},
+        {"name": ["me", "you"], "empty": []},
+        {"a b": "c d", "symbols": "&=+/?#%~._-"},
+        {"unicode": "ü∑😀", "kéy": ["1", "2 3"]},
+        {"": ""},
+    ],
+)
+def test_encode_query_string(params) -> None:
+    assert encode_query_string(params) == urlencode(params, doseq=True).encode()
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["plain", "with space", "a%20b", "a+b", "%E2%9C%93", "%zz", "ü", "a%2Bb"],
+)
+def test_requote_plus(value) -> None:
+    assert requote_plus(value) == quote_plus(unquote_plus(value))
+
+
+def test_encode_query_string_decoded() -> None:
+    params = {"my%20key": ["a+b", "c%26d"], "plain": "value"}
+    assert encode_query_string(params, decode=True) == b"my+key=a+b&my+key=c%26d&plain=value"
+
+
+def test_encode_query_string_memoized() -> None:
+    build_query_string.cache_clear()
+    assert encode_query_string({"name": ["me", "you"]}) == b"name=me&name=you"
+    assert encode_query_string({"name": ("me", "you")}) == b"name=me&name=you"
+    assert build_query_string.cache_info().hits == 1
+    assert encode_query_string({}) == encode_query_string(None) == b""
+
+
+@pytest.mark.parametrize(
+    "event,query_string",
+    [
+        ({"rawQueryString": "a=%20b&c"}, b"a=%20b&c"),
+        ({"rawQueryString": ""}, b""),
+        ({"multiValueQueryStringParameters": {"a": ["1", "2"]}, "queryStringParameters": {"a": "2"}}, b"a=1&a=2"),
+        ({"multiValueQueryStringParameters": None, "queryStringParameters": {"a": "2"}}, b"a=2"),
+        ({"queryStringParameters": None}, b""),
+        ({}, b""),
+    ],
+)
+def test_get_query_string(event, query_string) -> None:
+    assert get_query_string(event) == query_string
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+from mangum import Mangum
+from mangum.storage import LocalDirectoryStore, S3Store
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_response_store(mock_http_api_event_v2, tmp_path, make_app) -> None:
+    headers = [
+        [b"content-type", b"text/csv"],
+        [b"set-cookie", b"cookie1=cookie1; Secure"],
+        [b"x-custom", b"value"],
+    ]
+    body = b"a,b,c\n" * 100
+    store = LocalDirectoryStore(str(tmp_path), "https://example.com/exports/")
+    app, _ = make_app(headers, 200, body)
+    handler = Mangum(app, lifespan="off", response_store=store, response_store_threshold=100)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert response["statusCode"] == 303
+    assert response["cookies"] == ["cookie1=cookie1; Secure"]
+    assert response["body"] == ""
+    name = response["headers"]["location"].rsplit("/", 1)[1]
+    assert response["headers"]["location"] == f"https://example.com/exports/{name}"
+    assert (tmp_path / name).read_bytes() == body
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+@pytest.mark.parametrize(
+    "status,content_type,body_size,stored",
+    [
+        (200, b"text/plain", 100, False),
+        (200, b"text/plain", 101, True),
+        (500, b"text/plain", 101, False),
+        # Binary bodies are base64 encoded, which makes them a third larger.
+        (200, b"application/octet-stream", 75, False),
+        (200, b"application/octet-stream", 76, True),
+        (200, b"text/plain", 76, False),
+    ],
+)
+def test_response_store_threshold(
+    mock_http_api_event_v2, tmp_path, status, content_type, body_size, stored, make_app
+) -> None:
+    store = LocalDirectoryStore(str(tmp_path), "https://example.com")
+    app, _ = make_app([[b"content-type", content_type]], status, b"a" * body_size)
+    handler = Mangum(app, lifespan="off", response_store=store, response_store_threshold=100)
+    response = handler(mock_http_api_event_v2, {})
+
+    assert (response["statusCode"] == 303) is stored
+    assert len(list(tmp_path.iterdir())) == int(stored)
+
+
+class RecordingS3Client:
+    def __init__(self) -> None:
+        self.objects: list[dict] = []
+
+    def put_object(self, **kwargs) -> None:
+        self.objects.append(kwargs)
+
+    def generate_presigned_url(self, method: str, Params: dict, ExpiresIn: int) -> str:
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?{method}&expires={ExpiresIn}"
+
+
+@pytest.mark.parametrize("mock_aws_api_gateway_event", [["GET", None, None]], indirect=True)
+def test_s3_store(mock_aws_api_gateway_event, make_app) -> None:
+    client = RecordingS3Client()
+    store = S3Store("bucket", prefix="exports/", expires_in=60, client=client)
+    headers = [[b"content-type", b"application/json"], [b"content-encoding", b"gzip"]]
+    app, _ = make_app(headers, 200, b"{}" * 100)
+    handler = Mangum(app, lifespan="off", response_store=store, response_store_threshold=10)
+    response = handler(mock_aws_api_gateway_event, {})
+
+    key = client.objects[0]["Key"]
+    assert key.startswith("exports/")
+    assert client.objects == [
+        {
+            "Bucket": "bucket",
+            "Key": key,
+            "Body": b"{}" * 100,
+            "ContentType": "application/json",
+            "ContentEncoding": "gzip",
+        }
+    ]
+    assert response["statusCode"] == 303
+    assert response["headers"] == {"location": f"https://bucket.s3.amazonaws.com/{key}?get_object&expires=60"}
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from mangum import Mangum
+from mangum.streaming import PRELUDE_DELIMITER, RuntimeAPIStreamWriter
+
+
+class RecordingStreamWriter:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        assert not self.closed
+        self.chunks.append(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def parse_prelude(chunk: bytes) -> dict:
+    assert chunk.endswith(PRELUDE_DELIMITER)
+    return json.loads(chunk[: -len(PRELUDE_DELIMITER)])
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_stream_response(mock_http_api_event_v2) -> None:
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    [b"content-type", b"text/plain; charset=utf-8"],
+                    [b"set-cookie", b"cookie1=cookie1; Secure"],
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"Hello, ", "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": True})
+        await send({"type": "http.response.body", "body": b"world!", "more_body": False})
+
+    handler = Mangum(app, lifespan="off")
+    writer = RecordingStreamWriter()
+    handler.stream(mock_http_api_event_v2, {}, writer)
+
+    assert writer.closed
+    assert parse_prelude(writer.chunks[0]) == {
+        "statusCode": 200,
+        "headers": {"content-type": "text/plain; charset=utf-8"},
+        "cookies": ["cookie1=cookie1; Secure"],
+    }
+    assert writer.chunks[1:] == [b"Hello, ", b"world!"]
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_stream_response_error(mock_http_api_event_v2) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, ", "more_body": True})
+        raise Exception("Error!")
+
+    handler = Mangum(app, lifespan="off")
+    writer = RecordingStreamWriter()
+    handler.stream(mock_http_api_event_v2, {}, writer)
+
+    assert writer.closed
+    assert parse_prelude(writer.chunks[0])["statusCode"] == 200
+    assert writer.chunks[1:] == [b"Hello, "]
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_stream_response_error_before_start(mock_http_api_event_v2) -> None:
+    async def app(scope, receive, send):
+        raise Exception("Error!")
+
+    handler = Mangum(app, lifespan="off")
+    writer = RecordingStreamWriter()
+    handler.stream(mock_http_api_event_v2, {}, writer)
+
+    assert writer.closed
+    assert parse_prelude(writer.chunks[0]) == {
+        "statusCode": 500,
+        "headers": {"content-type": "text/plain; charset=utf-8"},
+    }
+    assert writer.chunks[1:] == [b"Internal Server Error"]
+
+
+def test_runtime_api_stream_writer() -> None:
+    requests: list[dict] = []
+
+    class RuntimeAPI(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:-2]
+                if not size:
+                    break
+                chunks.append(chunk)
+            requests.append({"path": self.path, "headers": dict(self.headers), "chunks": chunks})
+            self.send_response(202)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args) -> None: ...
+
+    server = HTTPServer(("127.0.0.1", 0), RuntimeAPI)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    try:
+        writer = RuntimeAPIStreamWriter("request-id", runtime_api="127.0.0.1:%d" % server.server_port)
+        writer.write(b"prelude" + PRELUDE_DELIMITER)
+        writer.write(b"")
+        writer.write(b"Hello, world!")
+        writer.close()
+    finally:
+        thread.join()
+        server.server_close()
+
+    assert requests[0]["path"] == "/2018-06-01/runtime/invocation/request-id/response"
+    assert requests[0]["headers"]["Lambda-Runtime-Function-Response-Mode"] == "streaming"
+    assert requests[0]["headers"]["Transfer-Encoding"] == "chunked"
+    assert requests[0]["chunks"] == [b"prelude" + PRELUDE_DELIMITER, b"Hello, world!"]
+
+
+@pytest.mark.parametrize(
+    "mock_http_api_event_v2",
+    [["GET", None, None, ""]],
+    indirect=True,
+)
+def test_stream_response_deadline(mock_http_api_event_v2, mock_lambda_context) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, ", "more_body": True})
+        await asyncio.sleep(10)
+
+    handler = Mangum(app, lifespan="off", deadline_margin_ms=0)
+    writer = RecordingStreamWriter()
+    handler.stream(mock_http_api_event_v2, mock_lambda_context(0), writer)
+
+    assert writer.closed
+    assert parse_prelude(writer.chunks[0])["statusCode"] == 200
+    assert writer.chunks[1:] == [b"Hello, "]
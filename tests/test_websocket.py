@@ -0,0 +1,73 @@
+import pytest
+
+from mangum.websocket import ManagementAPI, MemoryConnectionStore, SQLiteConnectionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryConnectionStore()
+    return SQLiteConnectionStore(str(tmp_path / "connections.db"))
+
+
+def test_connection_store(store) -> None:
+    connection = {"path": "/", "headers": [["host", "example.com"]], "subprotocol": None}
+    assert store.get("conn-1") is None
+    store.put("conn-1", connection)
+    assert store.get("conn-1") == connection
+    store.put("conn-1", {**connection, "path": "/ws"})
+    assert store.get("conn-1")["path"] == "/ws"
+    store.delete("conn-1")
+    store.delete("conn-1")
+    assert store.get("conn-1") is None
+
+
+def test_sqlite_connection_store_persisted(tmp_path) -> None:
+    path = str(tmp_path / "connections.db")
+    SQLiteConnectionStore(path).put("conn-1", {"path": "/"})
+    assert SQLiteConnectionStore(path).get("conn-1") == {"path": "/"}
+
+
+class RecordingClient:
+    def __init__(self, fail=()):
+        self.posts = []
+        self.deleted = []
+        self.fail = fail
+
+    def post_to_connection(self, ConnectionId, Data):
+        if ConnectionId in self.fail:
+            raise RuntimeError("GoneException")
+        self.posts.append((ConnectionId, Data))
+
+    def delete_connection(self, ConnectionId):
+        if ConnectionId in self.fail:
+            raise RuntimeError("GoneException")
+        self.deleted.append(ConnectionId)
+
+
+def test_management_api_send() -> None:
+    client = RecordingClient()
+    management_api = ManagementAPI(client=client)
+    management_api.send("https://example.com/prod", "a", ["1", b"2"], close=False)
+    assert client.posts == [("a", b"1"), ("a", b"2")]
+    assert client.deleted == []
+
+    management_api.send("https://example.com/prod", "a", [], close=True)
+    assert client.deleted == ["a"]
+
+
+def test_management_api_send_failures(caplog) -> None:
+    client = RecordingClient(fail=("gone",))
+    management_api = ManagementAPI(client=client)
+    management_api.send("https://example.com/prod", "gone", ["1", "2"], close=True)
+
+    assert client.posts == []
+    assert caplog.text.count("Failed to send a message to the WebSocket connection gone.") == 1
+    assert "Failed to close the WebSocket connection gone." in caplog.text
+
+
+def test_management_api_endpoint_url() -> None:
+    client = RecordingClient()
+    management_api = ManagementAPI(endpoint_url="http://localhost:3001")
+    management_api.clients["http://localhost:3001"] = client
+    assert management_api.get_client("https://example.com/prod") is client